@@ -2,11 +2,23 @@
 Tests for cache app.
 """
 
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
 from cache_utils import simple_cache
+from simple_cache import (
+    SimpleCache, _pack, _unpack, _RAW_VALUE, _ZLIB_VALUE,
+    _registry_shard, _registry_shard_keys
+)
 
 
 class CacheAppTests(APITestCase):
@@ -52,4 +64,97 @@ class CacheAppTests(APITestCase):
     def tearDown(self):
         """Clean up test data"""
         simple_cache.delete('test_key')
-        simple_cache.delete('test_key_2') 
\ No newline at end of file
+        simple_cache.delete('test_key_2') 
+
+
+class SimpleCacheTests(TestCase):
+    """
+    Tests for SimpleCache storage, registry and dump internals.
+    """
+    
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.dump_file = os.path.join(self.tmp_dir, 'cache_dump.json')
+        self.cache = self.new_cache()
+    
+    def tearDown(self):
+        """Clean up test data"""
+        cache.clear()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def new_cache(self):
+        """Create a SimpleCache on the test dump file, stopping its dump thread afterwards"""
+        instance = SimpleCache(dump_file=self.dump_file, auto_dump_interval=300)
+        self.addCleanup(instance.stop_auto_dump)
+        return instance
+    
+    def test_registry_flushed_at_exit(self):
+        """Test a deferred registry change is written when the process exits"""
+        with mock.patch('simple_cache.atexit.register') as register:
+            instance = self.new_cache()
+        register.assert_called_once_with(instance._flush_registry)
+        
+        instance.set('pending_key', 'value')
+        key = instance.get_all_keys()[0]
+        self.assertNotIn(key, self.new_cache().get_all_keys())
+        
+        # Run the exit hook as the interpreter would at shutdown
+        register.call_args.args[0]()
+        self.assertIn(key, self.new_cache().get_all_keys())
+    
+    def test_registry_shard_flush(self):
+        """Test registry changes are deferred and write only the shards they touched"""
+        self.cache.set('shard_key', 'value')
+        key = self.cache.get_all_keys()[0]
+        registry_key = self.cache.registry_key
+        self.assertEqual(cache.get_many(_registry_shard_keys(registry_key)), {})
+        
+        self.cache._flush_registry()
+        shards = cache.get_many(_registry_shard_keys(registry_key))
+        self.assertEqual(list(shards), [f"{registry_key}:{_registry_shard(key)}"])
+        self.assertEqual(set(*shards.values()), {key})
+    
+    def test_wal_replay(self):
+        """Test a restart rebuilds the dumped keys from the snapshot and its log"""
+        self.cache.set('first', 1)
+        self.assertTrue(self.cache.dump_cache_sync())
+        self.cache.set('second', 2)
+        self.cache.delete('first')
+        self.assertTrue(self.cache.dump_cache_sync())
+        
+        # The second dump only appended to the log
+        with open(self.dump_file, 'rb') as f:
+            self.assertEqual(len(json.loads(f.read())['key_registry']), 1)
+        self.assertTrue(os.path.exists(self.cache.wal_file))
+        
+        restarted = self.new_cache()
+        self.assertEqual(restarted._dumped_keys, set(self.cache.get_all_keys()))
+    
+    def test_stale_wal_ignored(self):
+        """Test a log written for another snapshot is ignored and replaced"""
+        self.cache.set('first', 1)
+        self.assertTrue(self.cache.dump_cache_sync())
+        with open(self.cache.wal_file, 'w') as f:
+            f.write('{"snapshot": "older"}\n{"op": "s", "k": "stale"}\n')
+        
+        restarted = self.new_cache()
+        self.assertIsNone(restarted._dumped_keys)
+        self.assertTrue(restarted.dump_cache_sync())
+        self.assertFalse(os.path.exists(restarted.wal_file))
+    
+    def test_pack_marks_values(self):
+        """Test values carry a raw or zlib marker and still read back"""
+        small = {'id': 1}
+        large = [{'name': 'record', 'value': i % 10} for i in range(2000)]
+        
+        self.assertEqual(_pack(small)[:1], _RAW_VALUE)
+        self.assertEqual(_pack(large)[:1], _ZLIB_VALUE)
+        self.assertLess(len(_pack(large)), len(pickle.dumps(large)))
+        self.assertEqual(_unpack(_pack(small)), small)
+        self.assertEqual(_unpack(_pack(large)), large)
+    
+    def test_unpack_legacy_pickle(self):
+        """Test values stored before the marker existed still read back"""
+        self.assertEqual(_unpack(pickle.dumps(['legacy', 1])), ['legacy', 1])
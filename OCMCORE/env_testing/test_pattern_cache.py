@@ -34,9 +34,8 @@ def test_pattern_operations():
     }
     
     # Store test data
-    for key, value in test_data.items():
-        simple_cache.set(key, value, timeout=3600)
-        print(f"✅ Stored: {key}")
+    simple_cache.mset(test_data, timeout=3600)
+    print(f"✅ Stored {len(test_data)} keys")
     
     print(f"\n📊 Total keys in cache: {simple_cache.size()}")
     
@@ -240,11 +239,14 @@ def test_regex_patterns():
         }
     ]
     
+    # Scan the registry once for all patterns
+    matches = simple_cache.get_keys_by_patterns([p["pattern"] for p in patterns])
+    
     for pattern_info in patterns:
         pattern = pattern_info["pattern"]
         description = pattern_info["description"]
         
-        keys = simple_cache.get_keys_by_pattern(pattern)
+        keys = matches[pattern]
         print(f"\n📝 {description}")
         print(f"   Pattern: {pattern}")
         print(f"   Found: {len(keys)} keys")
@@ -0,0 +1,59 @@
+"""
+Response renderers for logs app.
+"""
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # Fall back to DRF's json-based rendering
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson.
+    
+    orjson encodes straight to bytes and is several times faster than the
+    standard library encoder, which matters for large log payloads. Falls
+    back to JSONRenderer when orjson is not installed, when the client asks
+    for indented output, or for data orjson cannot encode.
+    """
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data into JSON bytes."""
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class PlainTextRenderer(BaseRenderer):
+    """
+    Plain text renderer for log content.
+    
+    Log content is rendered as its raw lines in file order; error payloads
+    are rendered as their message.
+    """
+    
+    media_type = 'text/plain'
+    format = 'txt'
+    charset = 'utf-8'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data into plain text bytes."""
+        if data is None:
+            return b''
+        if isinstance(data, dict):
+            if 'content' in data:
+                lines = [entry['raw_line'] for entry in reversed(data['content'])]
+                return ''.join(f'{line}\n' for line in lines).encode(self.charset)
+            if 'error' in data:
+                return f"{data['error']}\n".encode(self.charset)
+        return str(data).encode(self.charset)
+
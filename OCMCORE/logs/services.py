@@ -2,29 +2,919 @@
 Log viewing services for logs app.
 """
 
+import asyncio
+import hashlib
 import os
-import glob
+import mmap
+import multiprocessing
 import re
+import sqlite3
+import threading
 import time
-from datetime import datetime, timedelta
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date as dt_date, datetime, timedelta
+from functools import lru_cache, wraps
 from pathlib import Path
-from typing import List, Dict, Optional, Generator
-from collections import defaultdict, Counter
+from typing import List, Dict, Optional, Generator, AsyncGenerator, NamedTuple, Tuple
+from collections import defaultdict, deque, Counter
 
 from django.conf import settings
 
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # Non-Linux platform or inotify_simple not installed
+    INotify = None
+
+
+def _line_regex(level: str = r'[A-Z]{4,8}', message: str = r'.*') -> str:
+    """
+    Build the log line regex with the given level and message sub-patterns.
+    
+    Args:
+        level: Regex for the level field
+        message: Regex for the message field
+        
+    Returns:
+        Regex source matching a whole log line
+    """
+    # A bounded negated class for the timestamp never backtracks, unlike a lazy .*?
+    return (
+        r'^\[(?P<timestamp>[^\]]{1,40})\] '
+        rf'(?P<level>{level}) '
+        r'(?P<logger>\S+) (?P<process>\d+) (?P<thread>\d+) '
+        rf'(?P<message>{message})$'
+    )
+
+
+_LOG_PATTERN = re.compile(_line_regex())
+
+
+@lru_cache(maxsize=64)
+def _compiled_filter(level: str = '', search: str = ''):
+    """
+    Compile a log line pattern that only matches entries passing the filters.
+    
+    Folding the level and search filters into the regex lets non-matching
+    lines fail inside the regex engine instead of being parsed and then
+    discarded.
+    
+    Args:
+        level: Exact log level to match (empty for any level)
+        search: Case-insensitive substring of the message (empty for any)
+        
+    Returns:
+        Compiled pattern with the same groups as _LOG_PATTERN
+    """
+    if not level and not search:
+        return _LOG_PATTERN
+    return re.compile(_line_regex(
+        **({'level': re.escape(level)} if level else {}),
+        message=rf'.*(?i:{re.escape(search)}).*' if search else r'.*'
+    ))
+
+
+@lru_cache(maxsize=64)
+def _compiled_block_filter(level: str = '', search: str = ''):
+    """
+    Compile a bytes pattern that finds candidate lines in a whole buffer.
+    
+    Scanning a mapped file with finditer locates every line that can pass
+    the filters in a single pass of the regex engine, so only those lines
+    are decoded and parsed. Candidates must still be confirmed with
+    _compiled_filter, which applies the exact str semantics.
+    
+    Args:
+        level: Exact log level to match (empty for any level)
+        search: Case-insensitive substring of the message (empty for any)
+        
+    Returns:
+        Compiled multiline bytes pattern whose matches span whole lines
+    """
+    level_pattern = re.escape(level.encode()) if level else rb'[A-Z]{4,8}'
+    
+    # Bytes patterns only fold ASCII case, so other terms are left to the
+    # str pattern
+    message_pattern = rb'.*'
+    if search and search.isascii():
+        message_pattern = rb'.*(?i:' + re.escape(search.encode()) + rb').*'
+    
+    return re.compile(
+        rb'^[ \t]*\[[^\]\n]{1,40}\] ' + level_pattern + rb' \S+ \d+ \d+ ' + message_pattern + rb'$',
+        re.MULTILINE
+    )
+
+
+# Below this much log data, worker start-up costs more than parallel parsing saves
+_PARALLEL_STATS_MIN_BYTES = 8 * 1024 * 1024
+
+# Integer codes for the standard levels, so hot comparisons are int compares
+_LEVEL_CODE = {'DEBUG': 0, 'INFO': 1, 'WARNING': 2, 'ERROR': 3, 'CRITICAL': 4}
+_WARNING_CODE = _LEVEL_CODE['WARNING']
+_ERROR_CODE = _LEVEL_CODE['ERROR']
+
+# Statistics only need the timestamp and level of each record, so they are
+# pulled straight out of the mapped bytes without decoding whole lines. Like
+# the content parser, a record needs a non-blank message, and like strptime,
+# a time of day that exists; impossible dates are rejected in _file_stats.
+_STATS_RECORD = re.compile(
+    rb'^[ \t]*\[(\d{4}-\d\d-\d\d (?:[01]\d|2[0-3]):[0-5]\d:[0-5]\d,\d{3})\] '
+    rb'([A-Z]{4,8}) \S+ \d+ \d+ (?=[ \t\r\f\v]*[^\s])',
+    re.MULTILINE
+)
+
+# Level-only filters are by far the most common, so compile them up front
+for _level in _LEVEL_CODE:
+    _compiled_filter(_level, '')
+
+# Parsed (date, level) pairs buffered before being counted
+_STATS_BATCH_SIZE = 65536
+
+# Leading bytes fingerprinted to tell a grown file from one truncated in
+# place and written again
+_HEAD_BYTES = 4096
+
+# How long memoized directory listings and statistics stay valid
+_MEMO_TTL_SECONDS = 30
+
+# Memoized service results: key -> (expires_at, value)
+_memo: Dict[tuple, tuple] = {}
+
+# Whole-file statistics: path -> (st_mtime_ns, st_size, _FileStats)
+_file_stats_memo: Dict[str, tuple] = {}
+
+# Persistent statistics indexes by database path
+_stats_indexes: Dict[str, '_StatsIndex'] = {}
+
+# Log records start with "[timestamp] LEVEL", so a level filter only needs
+# to look at the head of each line
+_LEVEL_SCAN_BYTES = 40
+
+# Slice size used to count newlines without copying a whole mapped file
+_COUNT_CHUNK_BYTES = 1024 * 1024
+
+
+def _log_dir_memoize(method):
+    """
+    Memoize a LogViewerService method on the log directory mtime.
+    
+    Creating, rotating or deleting a log file changes the directory mtime
+    and invalidates the entry at once; appends to existing files are picked
+    up when the entry expires after _MEMO_TTL_SECONDS. Callers share the
+    returned object and must not mutate it.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            dir_mtime = os.stat(self.log_dir).st_mtime_ns
+        except OSError:
+            return method(self, *args, **kwargs)
+        
+        key = (method.__name__, self.log_dir, dir_mtime, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        cached = _memo.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        value = method(self, *args, **kwargs)
+        
+        # Drop expired entries, including those for older directory states
+        for stale_key, (expires_at, _) in list(_memo.items()):
+            if expires_at <= now:
+                _memo.pop(stale_key, None)
+        _memo[key] = (now + _MEMO_TTL_SECONDS, value)
+        return value
+    
+    return wrapper
+
+
+@contextmanager
+def _map_log_file(file_path: str, sequential: bool = True):
+    """
+    Memory-map a log file for reading.
+    
+    Args:
+        file_path: Path of the log file
+        sequential: Tell the kernel the file will be read front to back, so
+            it reads ahead aggressively and drops pages behind the scan
+        
+    Yields:
+        Read-only mmap of the file, or b'' for an empty file
+    """
+    with open(file_path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            yield b''
+            return
+        
+        # Access hints are advisory and not available on every platform
+        if sequential:
+            if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                try:
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                except OSError:
+                    pass
+            if hasattr(os, 'posix_fadvise'):
+                try:
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    pass
+        
+        try:
+            yield mm
+        finally:
+            mm.close()
+
+
+class _LineScanner:
+    """
+    Iterate over the newline-delimited records of a byte buffer.
+    
+    When a level is given, lines that do not carry it near the start are
+    skipped before being decoded, so heavily filtered scans avoid building
+    a str for every line.
+    """
+    
+    def __init__(self, buf, level: str = ''):
+        self.buf = buf
+        self.level_bytes = f' {level} '.encode() if level else b''
+        self.line_count = 0
+    
+    def __iter__(self) -> Generator[tuple, None, None]:
+        """Yield (line_number, line) for each candidate line."""
+        buf = self.buf
+        level_bytes = self.level_bytes
+        end = len(buf)
+        i = 0
+        line_num = 0
+        
+        while i < end:
+            j = buf.find(b'\n', i)
+            if j < 0:
+                j = end
+            line_num += 1
+            
+            if level_bytes and buf.find(level_bytes, i, min(j, i + _LEVEL_SCAN_BYTES)) < 0:
+                i = j + 1
+                continue
+            
+            line = buf[i:j]
+            i = j + 1
+            self.line_count = line_num
+            yield line_num, line.decode('utf-8', 'ignore')
+        
+        self.line_count = line_num
+
+
+def _count_newlines(buf, start: int, end: int) -> int:
+    """
+    Count the newlines in buf[start:end] without copying it all at once.
+    
+    Args:
+        buf: Bytes or mmap to count
+        start: First offset to count
+        end: Offset to stop at
+        
+    Returns:
+        Number of newline bytes in the range
+    """
+    count = 0
+    for i in range(start, end, _COUNT_CHUNK_BYTES):
+        count += buf[i:min(i + _COUNT_CHUNK_BYTES, end)].count(b'\n')
+    return count
+
+
+def _count_lines(buf) -> int:
+    """
+    Count the lines of a buffer the way _LineScanner numbers them.
+    
+    Args:
+        buf: Bytes or mmap to count
+        
+    Returns:
+        Number of lines, including an unterminated last line
+    """
+    count = _count_newlines(buf, 0, len(buf))
+    if len(buf) and buf[len(buf) - 1] != 0x0A:
+        count += 1
+    return count
+
+
+def _reverse_line_spans(buf, line_count: Optional[int] = None) -> Generator[tuple, None, None]:
+    """
+    Iterate over the lines of a buffer from last to first.
+    
+    Args:
+        buf: Bytes or mmap to scan
+        line_count: Result of _count_lines(buf), if already known
+        
+    Yields:
+        (line_number, start, end) byte spans, with the same numbering as
+        _LineScanner
+    """
+    line_num = _count_lines(buf) if line_count is None else line_count
+    j = len(buf)
+    if j and buf[j - 1] == 0x0A:
+        j -= 1
+    
+    while line_num > 0:
+        i = buf.rfind(b'\n', 0, j) + 1
+        yield line_num, i, j
+        line_num -= 1
+        j = i - 1
+
+
+def _log_entry(line_num: int, line: str, match) -> Dict:
+    """
+    Build a log content entry from a match of a _line_regex pattern.
+    
+    The fields are taken with a single group() call instead of going
+    through an intermediate groupdict.
+    
+    Args:
+        line_num: Line number in the file
+        line: Stripped log line
+        match: Match of the line against a _line_regex pattern
+        
+    Returns:
+        Dict with line_number, timestamp, level, logger, message and raw_line
+    """
+    timestamp, level, logger, message = match.group('timestamp', 'level', 'logger', 'message')
+    return {
+        'line_number': line_num,
+        'timestamp': timestamp,
+        'level': level,
+        'logger': logger,
+        'message': message,
+        'raw_line': line
+    }
+
+
+class _FileStats(NamedTuple):
+    """
+    Entry counts for one log file.
+    
+    Daily counts are parallel int arrays indexed by days since first_day,
+    a proleptic Gregorian ordinal.
+    """
+    level_counts: Counter
+    first_day: int
+    daily_totals: array
+    daily_errors: array
+    daily_warnings: array
+    total: int
+    first_dt: Optional[datetime]
+    last_dt: Optional[datetime]
+    indexed_bytes: int = 0  # offset just past the last complete line counted
+    head_digest: str = ''  # digest of the file's first indexed bytes
+
+
+def _timestamp_bytes(dt: datetime, round_up: bool = False) -> bytes:
+    """
+    Format a datetime the way log records write their timestamp.
+    
+    Args:
+        dt: Datetime to format
+        round_up: Round sub-millisecond remainders up instead of truncating
+        
+    Returns:
+        Timestamp bytes that compare in the same order as the datetimes
+    """
+    if round_up:
+        dt += timedelta(microseconds=999)
+    return f"{dt:%Y-%m-%d %H:%M:%S},{dt.microsecond // 1000:03d}".encode()
+
+
+def _parse_timestamp_bytes(timestamp: bytes) -> Optional[datetime]:
+    """Parse a record timestamp, returning None when it is not a valid date."""
+    try:
+        return datetime.strptime(timestamp.decode(), '%Y-%m-%d %H:%M:%S,%f')
+    except ValueError:
+        return None
+
+
+# Timestamps in this shape sort as strings in the same order as in time
+_STANDARD_TIMESTAMP = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2},[0-9]{3}')
+
+
+@lru_cache(maxsize=64)
+def _timestamp_bounds(start_dt: Optional[datetime], end_dt: Optional[datetime]) -> Tuple[str, str]:
+    """
+    Format date filter bounds as record timestamps, once per pair of bounds.
+    
+    Args:
+        start_dt: Oldest timestamp to include (None for no lower bound)
+        end_dt: Newest timestamp to include (None for no upper bound)
+        
+    Returns:
+        Tuple of (start, end) timestamp strings, empty where there is no bound
+    """
+    start_ts = _timestamp_bytes(start_dt, round_up=True).decode() if start_dt else ''
+    end_ts = _timestamp_bytes(end_dt).decode() if end_dt else ''
+    return start_ts, end_ts
+
+
+def _date_ordinal(date: bytes) -> Optional[int]:
+    """
+    Convert a YYYY-MM-DD date to a proleptic Gregorian ordinal.
+    
+    Args:
+        date: Date bytes from a log record
+        
+    Returns:
+        The ordinal, or None if the date does not exist
+    """
+    try:
+        return dt_date(int(date[:4]), int(date[5:7]), int(date[8:10])).toordinal()
+    except ValueError:
+        return None
+
+
+def _head_digest(data: bytes) -> str:
+    """Fingerprint the leading bytes of a log file."""
+    return hashlib.md5(data).hexdigest()
+
+
+def _read_head_digest(file_path: str, indexed_bytes: int) -> Optional[str]:
+    """
+    Fingerprint the part of a file's head that an index entry covered.
+    
+    Args:
+        file_path: Path of the log file
+        indexed_bytes: Bytes counted when the file was indexed
+        
+    Returns:
+        The digest, or None if the file is now shorter or unreadable
+    """
+    length = min(_HEAD_BYTES, indexed_bytes)
+    try:
+        with open(file_path, 'rb') as f:
+            head = f.read(length)
+    except OSError:
+        return None
+    return _head_digest(head) if len(head) == length else None
+
+
+def _file_stats(
+    file_path: str,
+    start_dt: Optional[datetime] = None,
+    end_dt: Optional[datetime] = None,
+    start_offset: int = 0
+) -> _FileStats:
+    """
+    Count the entries of one log file, optionally limited to a date range.
+    
+    Only complete lines are counted, so a file that is still being written
+    can later be resumed from indexed_bytes. Module-level so it can run in
+    a worker process.
+    
+    Args:
+        file_path: Path of the log file
+        start_dt: Oldest timestamp to include (None for no lower bound)
+        end_dt: Newest timestamp to include (None for no upper bound)
+        start_offset: Byte offset of the first line to count
+        
+    Returns:
+        _FileStats for the counted entries
+    """
+    # Timestamps are fixed width, so the bounds compare as bytes
+    start_ts = _timestamp_bytes(start_dt, round_up=True) if start_dt else None
+    end_ts = _timestamp_bytes(end_dt) if end_dt else None
+    
+    # (date, level) pairs are buffered and counted in batches by
+    # Counter.update, which runs in C, instead of updating dicts per line
+    pair_counts = Counter()
+    dates = []
+    levels = []
+    days = {}  # date -> ordinal, or None for an impossible date
+    first_ts = None
+    last_ts = None
+    indexed_bytes = start_offset
+    head_digest = ''
+    
+    try:
+        with _map_log_file(file_path) as buf:
+            indexed_bytes = max(buf.rfind(b'\n') + 1, start_offset)
+            head_digest = _head_digest(buf[:min(_HEAD_BYTES, indexed_bytes)])
+            for match in _STATS_RECORD.finditer(buf, start_offset, indexed_bytes):
+                timestamp, level = match.groups()
+                if (start_ts and timestamp < start_ts) or (end_ts and timestamp > end_ts):
+                    continue
+                
+                # Records on impossible dates are skipped entirely, as the
+                # baseline strptime check did
+                date = timestamp[:10]
+                try:
+                    if days[date] is None:
+                        continue
+                except KeyError:
+                    days[date] = _date_ordinal(date)
+                    if days[date] is None:
+                        continue
+                
+                if first_ts is None or timestamp < first_ts:
+                    first_ts = timestamp
+                if last_ts is None or timestamp > last_ts:
+                    last_ts = timestamp
+                
+                dates.append(date)
+                levels.append(level)
+                if len(dates) >= _STATS_BATCH_SIZE:
+                    pair_counts.update(zip(dates, levels))
+                    dates.clear()
+                    levels.clear()
+                    
+    except Exception:
+        # Skip files that can't be read
+        pass
+    
+    pair_counts.update(zip(dates, levels))
+    
+    days = {date: day for date, day in days.items() if day is not None}
+    first_day = min(days.values()) if days else 0
+    num_days = max(days.values()) - first_day + 1 if days else 0
+    daily_totals = array('q', bytes(8 * num_days))
+    daily_errors = array('q', bytes(8 * num_days))
+    daily_warnings = array('q', bytes(8 * num_days))
+    
+    # Derive level and daily counts from the (date, level) pairs
+    level_counts = Counter()
+    for (date, level), count in pair_counts.items():
+        level = level.decode()
+        level_counts[level] += count
+        
+        i = days[date] - first_day
+        daily_totals[i] += count
+        
+        # Unknown levels count as INFO
+        code = _LEVEL_CODE.get(level, 1)
+        if code >= _ERROR_CODE:
+            daily_errors[i] += count
+        elif code == _WARNING_CODE:
+            daily_warnings[i] += count
+    
+    first_dt = _parse_timestamp_bytes(first_ts) if first_ts else None
+    last_dt = _parse_timestamp_bytes(last_ts) if last_ts else None
+    
+    return _FileStats(
+        level_counts, first_day, daily_totals, daily_errors, daily_warnings,
+        sum(level_counts.values()), first_dt, last_dt, indexed_bytes, head_digest
+    )
+
+
+def _collect_file_stats(jobs: List[tuple], total_bytes: int) -> List[_FileStats]:
+    """
+    Run _file_stats for each (path, start_dt, end_dt[, start_offset]) job.
+    
+    Args:
+        jobs: Arguments for each _file_stats call
+        total_bytes: Combined size of the files to parse
+        
+    Returns:
+        List of _FileStats in job order
+    """
+    if not jobs:
+        return []
+    
+    # Parse files in parallel when there is enough data to amortize worker start-up
+    if len(jobs) > 1 and total_bytes >= _PARALLEL_STATS_MIN_BYTES:
+        # Spawn rather than fork: the web process runs background threads
+        with ProcessPoolExecutor(
+            max_workers=min(len(jobs), os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context('spawn')
+        ) as executor:
+            return list(executor.map(_file_stats, *zip(*jobs)))
+    
+    return [_file_stats(*job) for job in jobs]
+
+
+class _StatsIndex:
+    """
+    SQLite sidecar that persists per-file statistics between requests.
+    
+    Whole-file counts survive restarts and are shared by all worker
+    processes. A file that has only grown since it was indexed is resumed
+    from the last indexed offset instead of being parsed again; a digest of
+    its first bytes tells growth apart from a copytruncate rotation that
+    keeps the inode. Connections are per thread; every write is a short
+    transaction so concurrent workers cannot apply the same append twice.
+    """
+    
+    _SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            inode INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            indexed_bytes INTEGER NOT NULL,
+            first_ts TEXT,
+            last_ts TEXT,
+            head_digest TEXT NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS daily (
+            path TEXT NOT NULL,
+            day INTEGER NOT NULL,
+            total_entries INTEGER NOT NULL,
+            errors INTEGER NOT NULL,
+            warnings INTEGER NOT NULL,
+            PRIMARY KEY (path, day)
+        )""",
+        """CREATE TABLE IF NOT EXISTS levels (
+            path TEXT NOT NULL,
+            level TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (path, level)
+        )""",
+    )
+    
+    # Bumped whenever the way entries are counted changes, so counts stored
+    # by an older version are dropped instead of reused
+    _VERSION = 1
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, creating the schema on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if conn.execute('PRAGMA user_version').fetchone()[0] != self._VERSION:
+                    for table in ('files', 'daily', 'levels'):
+                        conn.execute(f'DROP TABLE IF EXISTS {table}')
+                    conn.execute(f'PRAGMA user_version = {self._VERSION}')
+                for statement in self._SCHEMA:
+                    conn.execute(statement)
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            self._local.conn = conn
+        return conn
+    
+    def load(self, path: str) -> Optional[tuple]:
+        """
+        Load the indexed statistics of a file.
+        
+        Args:
+            path: Path of the log file
+            
+        Returns:
+            Tuple of (inode, mtime_ns, size, _FileStats), or None if the file
+            has not been indexed
+        """
+        conn = self._connection()
+        row = conn.execute(
+            'SELECT inode, mtime_ns, size, indexed_bytes, first_ts, last_ts, head_digest FROM files WHERE path = ?',
+            (path,)
+        ).fetchone()
+        if row is None:
+            return None
+        inode, mtime_ns, size, indexed_bytes, first_ts, last_ts, head_digest = row
+        
+        level_counts = Counter(dict(conn.execute(
+            'SELECT level, count FROM levels WHERE path = ?', (path,)
+        ).fetchall()))
+        days = conn.execute(
+            'SELECT day, total_entries, errors, warnings FROM daily WHERE path = ? ORDER BY day',
+            (path,)
+        ).fetchall()
+        
+        first_day = days[0][0] if days else 0
+        num_days = days[-1][0] - first_day + 1 if days else 0
+        daily_totals = array('q', bytes(8 * num_days))
+        daily_errors = array('q', bytes(8 * num_days))
+        daily_warnings = array('q', bytes(8 * num_days))
+        for day, total_entries, errors, warnings in days:
+            daily_totals[day - first_day] = total_entries
+            daily_errors[day - first_day] = errors
+            daily_warnings[day - first_day] = warnings
+        
+        file_stats = _FileStats(
+            level_counts, first_day, daily_totals, daily_errors, daily_warnings,
+            sum(level_counts.values()),
+            _parse_timestamp_bytes(first_ts.encode()) if first_ts else None,
+            _parse_timestamp_bytes(last_ts.encode()) if last_ts else None,
+            indexed_bytes, head_digest
+        )
+        return inode, mtime_ns, size, file_stats
+    
+    def store(self, path: str, st: os.stat_result, file_stats: _FileStats, resumed_from: Optional[int] = None) -> bool:
+        """
+        Record the statistics of a file.
+        
+        Args:
+            path: Path of the log file
+            st: Stat of the file when it was parsed
+            file_stats: Counts for the whole file, or for the appended part
+                when resumed_from is given
+            resumed_from: indexed_bytes the appended part was parsed from
+            
+        Returns:
+            False if an append no longer applies because the index changed
+            in the meantime
+        """
+        conn = self._connection()
+        first_ts = _timestamp_bytes(file_stats.first_dt).decode() if file_stats.first_dt else None
+        last_ts = _timestamp_bytes(file_stats.last_dt).decode() if file_stats.last_dt else None
+        
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if resumed_from is None:
+                conn.execute('DELETE FROM daily WHERE path = ?', (path,))
+                conn.execute('DELETE FROM levels WHERE path = ?', (path,))
+                conn.execute(
+                    'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (path, st.st_ino, st.st_mtime_ns, st.st_size, file_stats.indexed_bytes, first_ts, last_ts,
+                     file_stats.head_digest)
+                )
+            else:
+                row = conn.execute('SELECT indexed_bytes FROM files WHERE path = ?', (path,)).fetchone()
+                if row is None or row[0] != resumed_from:
+                    conn.execute('ROLLBACK')
+                    return False
+                conn.execute(
+                    """UPDATE files SET inode = ?, mtime_ns = ?, size = ?, indexed_bytes = ?, head_digest = ?,
+                        first_ts = CASE WHEN first_ts IS NULL OR ? < first_ts THEN ? ELSE first_ts END,
+                        last_ts = CASE WHEN last_ts IS NULL OR ? > last_ts THEN ? ELSE last_ts END
+                    WHERE path = ?""",
+                    (st.st_ino, st.st_mtime_ns, st.st_size, file_stats.indexed_bytes, file_stats.head_digest,
+                     first_ts, first_ts, last_ts, last_ts, path)
+                )
+            
+            conn.executemany(
+                """INSERT INTO daily VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (path, day) DO UPDATE SET
+                    total_entries = total_entries + excluded.total_entries,
+                    errors = errors + excluded.errors,
+                    warnings = warnings + excluded.warnings""",
+                [
+                    (path, file_stats.first_day + i, total_entries,
+                     file_stats.daily_errors[i], file_stats.daily_warnings[i])
+                    for i, total_entries in enumerate(file_stats.daily_totals) if total_entries
+                ]
+            )
+            conn.executemany(
+                """INSERT INTO levels VALUES (?, ?, ?)
+                ON CONFLICT (path, level) DO UPDATE SET count = count + excluded.count""",
+                [(path, level, count) for level, count in file_stats.level_counts.items()]
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return True
+    
+    def prune(self, keep_paths: set) -> None:
+        """Drop index entries for files that no longer exist."""
+        conn = self._connection()
+        stale = [
+            (path,) for (path,) in conn.execute('SELECT path FROM files').fetchall()
+            if path not in keep_paths
+        ]
+        if not stale:
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for table in ('files', 'daily', 'levels'):
+                conn.executemany(f'DELETE FROM {table} WHERE path = ?', stale)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+
+def _get_stats_index(log_dir: str) -> Optional[_StatsIndex]:
+    """
+    Get the statistics index for a log directory.
+    
+    Unless LOG_STATS_INDEX says otherwise the index lives in a hidden
+    subdirectory of the log directory, so its WAL files change the
+    subdirectory's mtime rather than the one that keys the memoized listings.
+    
+    Args:
+        log_dir: Log directory
+        
+    Returns:
+        The shared _StatsIndex, or None if the index cannot be used
+    """
+    db_path = getattr(settings, 'LOG_STATS_INDEX', None)
+    if db_path is None:
+        db_path = os.path.join(log_dir, '.index', 'stats.sqlite')
+        try:
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        except OSError:
+            return None
+    index = _stats_indexes.get(db_path)
+    if index is None:
+        index = _stats_indexes.setdefault(db_path, _StatsIndex(db_path))
+    try:
+        index._connection()
+    except sqlite3.Error:
+        return None
+    return index
+
+
+class _PollingTailer:
+    """
+    Wake up at a fixed interval so the caller can check a file for new data.
+    """
+    
+    def __init__(self, file_path: str, interval: float = 1.0):
+        self.file_path = file_path
+        self.interval = interval
+    
+    def read(self) -> Generator[None, None, None]:
+        """Yield once per polling interval."""
+        while True:
+            time.sleep(self.interval)
+            yield None
+    
+    async def aread(self) -> AsyncGenerator[None, None]:
+        """Yield once per polling interval without blocking the event loop."""
+        while True:
+            await asyncio.sleep(self.interval)
+            yield None
+    
+    def close(self) -> None:
+        """Nothing to release for the polling tailer."""
+
+
+class _InotifyTailer:
+    """
+    Block in the kernel until a file is appended to, using inotify.
+    """
+    
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.inotify = INotify()
+        self.inotify.add_watch(
+            file_path,
+            inotify_flags.MODIFY | inotify_flags.MOVE_SELF | inotify_flags.DELETE_SELF
+        )
+    
+    def read(self) -> Generator[list, None, None]:
+        """
+        Yield a batch of events each time the file is modified.
+        
+        Stops when the file is rotated away or deleted, since the watch
+        follows the old inode and would never fire again.
+        """
+        while True:
+            events = self.inotify.read()
+            if any(event.mask & (inotify_flags.MOVE_SELF | inotify_flags.DELETE_SELF) for event in events):
+                return
+            if events:
+                yield events
+    
+    async def aread(self) -> AsyncGenerator[list, None]:
+        """
+        Asynchronously yield a batch of events each time the file is modified.
+        
+        The inotify descriptor is registered with the running event loop, so
+        waiting for the next write costs neither a thread nor a poll.
+        """
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+        fd = self.inotify.fileno()
+        loop.add_reader(fd, ready.set)
+        try:
+            while True:
+                await ready.wait()
+                ready.clear()
+                events = self.inotify.read(timeout=0)
+                if any(event.mask & (inotify_flags.MOVE_SELF | inotify_flags.DELETE_SELF) for event in events):
+                    return
+                if events:
+                    yield events
+        finally:
+            loop.remove_reader(fd)
+    
+    def close(self) -> None:
+        """Release the inotify file descriptor."""
+        self.inotify.close()
+
 
 class LogViewerService:
     """
     Service for viewing and analyzing log files.
+    
+    Instances are shared across request threads, so methods must not keep
+    per-request state on self.
     """
     
     def __init__(self):
         """Initialize the log viewer service."""
         self.log_dir = getattr(settings, 'LOG_DIR', os.path.join(settings.BASE_DIR, 'logs'))
-        self.log_pattern = re.compile(
-            r'^\[(?P<timestamp>.*?)\] (?P<level>\w+) (?P<logger>\w+) (?P<process>\d+) (?P<thread>\d+) (?P<message>.*)$'
-        )
+        self.log_pattern = _LOG_PATTERN
     
     def get_all_log_files(self) -> Dict:
         """
@@ -33,9 +923,6 @@ class LogViewerService:
         Returns:
             Dict containing log files information
         """
-        log_files = []
-        total_size = 0
-        
         if not os.path.exists(self.log_dir):
             return {
                 'log_files': [],
@@ -44,28 +931,7 @@ class LogViewerService:
                 'error': 'Log directory does not exist'
             }
         
-        # Get all log files (including rotated ones)
-        for file_path in glob.glob(os.path.join(self.log_dir, '*.log*')):
-            if os.path.isfile(file_path):
-                stat = os.stat(file_path)
-                file_name = os.path.basename(file_path)
-                
-                # Extract app name and date from filename
-                app_name, date = self._parse_log_filename(file_name)
-                
-                log_files.append({
-                    'name': file_name,
-                    'path': file_path,
-                    'size': stat.st_size,
-                    'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    'app_name': app_name,
-                    'date': date,
-                    'size_mb': round(stat.st_size / (1024 * 1024), 2)
-                })
-                total_size += stat.st_size
-        
-        # Sort by modification time (newest first)
-        log_files.sort(key=lambda x: x['modified'], reverse=True)
+        log_files, total_size, _ = self._scan_log_dir()
         
         return {
             'log_files': log_files,
@@ -74,6 +940,29 @@ class LogViewerService:
             'log_directory': self.log_dir
         }
     
+    def get_available_apps(self) -> List[str]:
+        """
+        Get the names of apps that have log files.
+        
+        Returns:
+            Sorted list of app names
+        """
+        if not os.path.exists(self.log_dir):
+            return []
+        return self._scan_log_dir()[2]
+    
+    @_log_dir_memoize
+    def get_log_file_names(self) -> frozenset:
+        """
+        Get the names of all log files in the log directory.
+        
+        Returns:
+            Frozenset of file names, for cheap membership checks
+        """
+        if not os.path.exists(self.log_dir):
+            return frozenset()
+        return frozenset(f['name'] for f in self._scan_log_dir()[0])
+    
     def get_log_content(
         self,
         filename: str,
@@ -81,7 +970,8 @@ class LogViewerService:
         level: str = '',
         search: str = '',
         start_date: str = '',
-        end_date: str = ''
+        end_date: str = '',
+        lazy: bool = False
     ) -> Dict:
         """
         Get log file content with optional filtering.
@@ -93,6 +983,9 @@ class LogViewerService:
             search: Search term in log messages
             start_date: Start date filter (YYYY-MM-DD)
             end_date: End date filter (YYYY-MM-DD)
+            lazy: Return content as a generator that builds each entry on
+                demand, so a caller encoding entries one by one never holds
+                them all at once
             
         Returns:
             Dict containing filtered log content
@@ -102,75 +995,166 @@ class LogViewerService:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Log file '{filename}' not found")
         
-        content = []
+        # Only the last `lines` matches are kept, so memory stays bounded
+        # however large the file or the requested line count is
+        matches = deque(maxlen=max(lines, 0))
         total_lines = 0
-        filtered_lines = 0
         
         # Parse date filters
-        start_dt = None
-        end_dt = None
-        if start_date:
-            try:
-                start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-            except ValueError:
-                pass
-        if end_date:
-            try:
-                end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-                end_dt = end_dt.replace(hour=23, minute=59, second=59)
-            except ValueError:
-                pass
+        start_dt, end_dt = self._parse_date_range(start_date, end_date)
+        
+        # Level and search filters are applied by the line patterns themselves
+        pattern = _compiled_filter(level, search)
+        block_pattern = _compiled_block_filter(level, search)
+        
+        # Read and filter log file. Candidate lines are found by one scan of
+        # the whole buffer; only those are decoded and parsed.
+        with _map_log_file(file_path) as buf:
+            line_num = 1
+            offset = 0
+            for candidate in block_pattern.finditer(buf):
+                start, end = candidate.span()
+                line_num += _count_newlines(buf, offset, start)
+                offset = start
+                
+                line = buf[start:end].decode('utf-8', 'ignore').strip()
+                
+                # Parse and filter log line
+                match = pattern.match(line)
+                if not match:
+                    continue
+                
+                # Apply date filters
+                if (start_dt or end_dt) and not self._in_date_range(match.group('timestamp'), start_dt, end_dt):
+                    continue
+                
+                matches.append((line_num, line, match))
+            
+            total_lines = _count_lines(buf)
+        
+        # Reverse to show newest first
+        content = (_log_entry(line_num, line, match) for line_num, line, match in reversed(matches))
+        if not lazy:
+            content = list(content)
+        
+        return {
+            'filename': filename,
+            'total_lines': total_lines,
+            'filtered_lines': len(matches),
+            'content': content,
+            'filters_applied': {
+                'lines': lines,
+                'level': level,
+                'search': search,
+                'start_date': start_date,
+                'end_date': end_date
+            }
+        }
+    
+    def iter_log_content(
+        self,
+        filename: str,
+        lines: int = 100,
+        level: str = '',
+        search: str = '',
+        start_date: str = '',
+        end_date: str = ''
+    ) -> Generator[Dict, None, None]:
+        """
+        Iterate over the last matching entries of a log file, newest first.
+        
+        The file is read backwards from the end, so only the tail needed to
+        find `lines` matches is scanned. The file is checked up front, so a
+        missing file raises before iteration starts.
+        
+        Args:
+            filename: Name of the log file
+            lines: Maximum number of entries to yield
+            level: Filter by log level
+            search: Search term in log messages
+            start_date: Start date filter (YYYY-MM-DD)
+            end_date: End date filter (YYYY-MM-DD)
+            
+        Returns:
+            Generator of entries shaped like get_log_content's content items
+        """
+        file_path = os.path.join(self.log_dir, filename)
+        
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Log file '{filename}' not found")
+        
+        start_dt, end_dt = self._parse_date_range(start_date, end_date)
+        return self._iter_tail_file(file_path, lines, level, search, start_dt, end_dt)
+    
+    def tail_log_content(self, filename: str, lines: int = 100) -> Dict:
+        """
+        Get the last lines of a log file when no filters are applied.
+        
+        Unlike get_log_content, the file is read backwards and reading stops
+        once `lines` entries are found, so the cost depends on the number of
+        lines requested rather than on the file size. filtered_lines is the
+        number of entries returned.
+        
+        Args:
+            filename: Name of the log file
+            lines: Number of lines to return
+            
+        Returns:
+            Dict shaped like get_log_content's result
+        """
+        file_path = os.path.join(self.log_dir, filename)
         
-        # Read and filter log file
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line_num, line in enumerate(f, 1):
-                total_lines += 1
-                line = line.strip()
-                
-                if not line:
-                    continue
-                
-                # Parse log line
-                parsed = self._parse_log_line(line)
-                if not parsed:
-                    continue
-                
-                # Apply filters
-                if not self._apply_filters(parsed, level, search, start_dt, end_dt):
-                    continue
-                
-                content.append({
-                    'line_number': line_num,
-                    'timestamp': parsed['timestamp'],
-                    'level': parsed['level'],
-                    'logger': parsed['logger'],
-                    'message': parsed['message'],
-                    'raw_line': line
-                })
-                
-                filtered_lines += 1
-                
-                # Limit number of lines
-                if len(content) >= lines:
-                    break
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Log file '{filename}' not found")
         
-        # Reverse to show newest first
-        content.reverse()
+        with _map_log_file(file_path, sequential=False) as buf:
+            total_lines = _count_lines(buf)
+            content = list(self._iter_tail_entries(buf, total_lines, lines, '', '', None, None))
         
         return {
             'filename': filename,
             'total_lines': total_lines,
-            'filtered_lines': filtered_lines,
+            'filtered_lines': len(content),
             'content': content,
             'filters_applied': {
                 'lines': lines,
-                'level': level,
-                'search': search,
-                'start_date': start_date,
-                'end_date': end_date
+                'level': '',
+                'search': '',
+                'start_date': '',
+                'end_date': ''
             }
         }
     
+    def open_log_tail(self, filename: str, lines: int = 100):
+        """
+        Open a log file positioned at the start of its last lines.
+        
+        The raw bytes are meant to be returned as-is, so the caller can hand
+        the file to the server for a zero-copy send.
+        
+        Args:
+            filename: Name of the log file
+            lines: Number of raw lines to leave before the end of the file
+            
+        Returns:
+            Binary file object seeked to the tail offset
+        """
+        file_path = os.path.join(self.log_dir, filename)
+        
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Log file '{filename}' not found")
+        
+        offset = 0
+        with _map_log_file(file_path, sequential=False) as buf:
+            for remaining, (_, i, _) in enumerate(_reverse_line_spans(buf), 1):
+                offset = i
+                if remaining >= lines:
+                    break
+        
+        f = open(file_path, 'rb')
+        f.seek(offset)
+        return f
+    
     def get_app_logs(
         self,
         app_name: str,
@@ -193,26 +1177,26 @@ class LogViewerService:
         # Find the appropriate log file for the app
         if date == 'latest':
             # Find the most recent log file for this app
-            pattern = os.path.join(self.log_dir, f'{app_name}.log*')
-            log_files = glob.glob(pattern)
-            if not log_files:
+            file_path = self._latest_app_log(app_name)
+            if not file_path:
                 raise FileNotFoundError(f"No logs found for app '{app_name}'")
-            
-            # Sort by modification time and get the latest
-            log_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-            filename = os.path.basename(log_files[0])
+            filename = os.path.basename(file_path)
         else:
             # Look for specific date
             filename = f'{app_name}.log.{date}'
             if not os.path.exists(os.path.join(self.log_dir, filename)):
                 raise FileNotFoundError(f"No logs found for app '{app_name}' on date '{date}'")
         
-        # Get log content using the existing method
-        content = self.get_log_content(
-            filename=filename,
-            lines=lines,
-            level=level
-        )
+        # Get log content using the existing methods, reading only the tail
+        # of the file when there is nothing to filter
+        if level:
+            content = self.get_log_content(
+                filename=filename,
+                lines=lines,
+                level=level
+            )
+        else:
+            content = self.tail_log_content(filename=filename, lines=lines)
         
         # Add app-specific information
         content['app_name'] = app_name
@@ -220,6 +1204,7 @@ class LogViewerService:
         
         return content
     
+    @_log_dir_memoize
     def get_log_statistics(self, app_name: str = '', days: int = 7) -> Dict:
         """
         Get log statistics and analytics.
@@ -234,7 +1219,7 @@ class LogViewerService:
         stats = {
             'total_log_files': 0,
             'total_log_entries': 0,
-            'level_distribution': defaultdict(int),
+            'level_distribution': Counter(),
             'app_distribution': defaultdict(int),
             'daily_stats': [],
             'analyzed_days': days
@@ -254,56 +1239,142 @@ class LogViewerService:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
-        # Initialize daily stats
-        daily_stats = defaultdict(lambda: {'total_entries': 0, 'errors': 0, 'warnings': 0})
-        
-        # Process each log file
+        # Whole-file statistics are memoized per (mtime, size), so only files
+        # that changed since the last request are parsed again. Files last
+        # written, or rotated out, before the window starts cannot hold any
+        # entries inside it and are not read at all.
+        start_ts = start_date.timestamp()
+        candidates = []
+        stale = []
         for log_file in log_files:
-            file_path = log_file['path']
-            app = log_file['app_name']
-            
+            rotated_on = self._parse_rotation_date(log_file['date'])
+            if rotated_on and rotated_on < start_date.date():
+                continue
             try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        
-                        parsed = self._parse_log_line(line)
-                        if not parsed:
-                            continue
-                        
-                        # Check if within date range
-                        try:
-                            log_dt = datetime.strptime(parsed['timestamp'], '%Y-%m-%d %H:%M:%S,%f')
-                            if log_dt < start_date or log_dt > end_date:
-                                continue
-                        except ValueError:
-                            continue
-                        
-                        # Update statistics
-                        stats['total_log_entries'] += 1
-                        stats['level_distribution'][parsed['level']] += 1
-                        stats['app_distribution'][app] += 1
-                        
-                        # Update daily stats
-                        date_key = log_dt.strftime('%Y-%m-%d')
-                        daily_stats[date_key]['total_entries'] += 1
-                        
-                        if parsed['level'] in ['ERROR', 'CRITICAL']:
-                            daily_stats[date_key]['errors'] += 1
-                        elif parsed['level'] == 'WARNING':
-                            daily_stats[date_key]['warnings'] += 1
-                            
-            except Exception as e:
-                # Skip files that can't be read
+                st = os.stat(log_file['path'])
+            except OSError:
+                continue
+            if st.st_mtime < start_ts:
+                continue
+            candidates.append(log_file)
+            cached = _file_stats_memo.get(log_file['path'])
+            if not cached or cached[:2] != (st.st_mtime_ns, st.st_size):
+                stale.append((log_file, st))
+        
+        # Files missing from the in-process memo are looked up in the
+        # persistent index; files that only grew since they were indexed, with
+        # their first bytes unchanged, are parsed from the indexed offset,
+        # anything else from the start
+        index = _get_stats_index(self.log_dir) if stale else None
+        jobs = []
+        for log_file, st in stale:
+            path = log_file['path']
+            indexed = None
+            if index:
+                try:
+                    indexed = index.load(path)
+                except sqlite3.Error:
+                    index = None
+            if indexed and indexed[:3] == (st.st_ino, st.st_mtime_ns, st.st_size):
+                _file_stats_memo[path] = (st.st_mtime_ns, st.st_size, indexed[3])
+                continue
+            if (
+                indexed and indexed[0] == st.st_ino
+                and st.st_size >= indexed[3].indexed_bytes
+                and _read_head_digest(path, indexed[3].indexed_bytes) == indexed[3].head_digest
+            ):
+                jobs.append((log_file, st, indexed[3].indexed_bytes))
+            else:
+                jobs.append((log_file, st, None))
+        
+        parsed = _collect_file_stats(
+            [(log_file['path'], None, None, resume or 0) for log_file, _, resume in jobs],
+            sum(st.st_size - (resume or 0) for _, st, resume in jobs)
+        )
+        for (log_file, st, resume), file_stats in zip(jobs, parsed):
+            path = log_file['path']
+            if index:
+                try:
+                    # Appends are merged into the indexed counts by the
+                    # database, so the file's totals are read back
+                    if not index.store(path, st, file_stats, resume) or resume is not None:
+                        indexed = index.load(path)
+                        file_stats = indexed[3] if indexed else _file_stats(path)
+                except sqlite3.Error:
+                    index = None
+            if resume is not None and not index:
+                # The appended part alone is not the file's statistics
+                file_stats = _file_stats(path)
+            _file_stats_memo[path] = (st.st_mtime_ns, st.st_size, file_stats)
+        
+        # Forget files that have been rotated away
+        current_paths = {f['path'] for f in all_files['log_files']}
+        for path in list(_file_stats_memo):
+            if path not in current_paths:
+                _file_stats_memo.pop(path, None)
+        if index:
+            try:
+                index.prune(current_paths)
+            except sqlite3.Error:
+                pass
+        
+        # Files entirely inside the window contribute their whole-file counts,
+        # files entirely outside contribute nothing, and files straddling a
+        # boundary are parsed again with the window applied
+        results = {}
+        straddling = []
+        for log_file in candidates:
+            cached = _file_stats_memo.get(log_file['path'])
+            if not cached or not cached[2].total:
+                continue
+            file_stats = cached[2]
+            if not file_stats.first_dt or not file_stats.last_dt:
+                straddling.append(log_file)
+                continue
+            if file_stats.last_dt < start_date or file_stats.first_dt > end_date:
+                continue
+            if file_stats.first_dt >= start_date and file_stats.last_dt <= end_date:
+                results[log_file['path']] = file_stats
+            else:
+                straddling.append(log_file)
+        
+        windowed = _collect_file_stats(
+            [(log_file['path'], start_date, end_date) for log_file in straddling],
+            sum(log_file['size'] for log_file in straddling)
+        )
+        for log_file, file_stats in zip(straddling, windowed):
+            results[log_file['path']] = file_stats
+        
+        # Merge per-file counters into one slot per day of the window
+        start_day = start_date.date().toordinal()
+        num_days = max(end_date.date().toordinal() - start_day + 1, 0)
+        daily_totals = array('q', bytes(8 * num_days))
+        daily_errors = array('q', bytes(8 * num_days))
+        daily_warnings = array('q', bytes(8 * num_days))
+        for log_file in log_files:
+            file_stats = results.get(log_file['path'])
+            if not file_stats or not file_stats.total:
                 continue
+            stats['total_log_entries'] += file_stats.total
+            stats['level_distribution'].update(file_stats.level_counts)
+            stats['app_distribution'][log_file['app_name']] += file_stats.total
+            
+            offset = file_stats.first_day - start_day
+            for i, count in enumerate(file_stats.daily_totals):
+                if count and 0 <= offset + i < num_days:
+                    daily_totals[offset + i] += count
+                    daily_errors[offset + i] += file_stats.daily_errors[i]
+                    daily_warnings[offset + i] += file_stats.daily_warnings[i]
         
-        # Convert daily stats to list
-        for date in sorted(daily_stats.keys()):
+        # Convert daily stats to list, skipping days without entries
+        for i, total in enumerate(daily_totals):
+            if not total:
+                continue
             stats['daily_stats'].append({
-                'date': date,
-                **daily_stats[date]
+                'date': (start_date + timedelta(days=i)).strftime('%Y-%m-%d'),
+                'total_entries': total,
+                'errors': daily_errors[i],
+                'warnings': daily_warnings[i]
             })
         
         # Convert defaultdict to regular dict for JSON serialization
@@ -323,50 +1394,67 @@ class LogViewerService:
         Yields:
             Log lines as they are written
         """
-        # Find the current log file for the app
-        if app_name:
-            pattern = os.path.join(self.log_dir, f'{app_name}.log*')
-            log_files = glob.glob(pattern)
-            if not log_files:
-                yield f"data: No logs found for app '{app_name}'\n\n"
-                return
-            
-            # Get the most recent file
-            log_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-            file_path = log_files[0]
-        else:
-            # Stream from main log file
-            file_path = os.path.join(self.log_dir, 'ocmcore.log')
-            if not os.path.exists(file_path):
-                yield f"data: No main log file found\n\n"
-                return
+        file_path, error = self._stream_target(app_name)
+        if error:
+            yield error
+            return
         
         # Get initial file size
         initial_size = os.path.getsize(file_path)
         
-        # Stream new log entries
-        while True:
-            try:
+        # Stream new log entries as the file is appended to
+        tailer = self._create_tailer(file_path)
+        try:
+            for _ in tailer.read():
                 current_size = os.path.getsize(file_path)
                 
                 if current_size > initial_size:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        f.seek(initial_size)
-                        new_content = f.read()
-                        
-                        for line in new_content.splitlines():
-                            if line.strip():
-                                parsed = self._parse_log_line(line.strip())
-                                if parsed and self._apply_filters(parsed, level, '', None, None):
-                                    yield f"data: {line}\n\n"
+                    initial_size = yield from self._emit_new_lines(file_path, initial_size, current_size, level)
                     
-                    initial_size = current_size
-                
-                time.sleep(1)  # Check every second
+        except Exception as e:
+            yield f"data: Error streaming logs: {str(e)}\n\n"
+        finally:
+            tailer.close()
+    
+    async def astream_logs(self, app_name: str = '', level: str = '') -> AsyncGenerator[str, None]:
+        """
+        Stream real-time logs without holding a worker thread.
+        
+        Async counterpart of stream_logs for ASGI deployments: waiting for
+        new data happens on the event loop rather than in a blocked thread.
+        
+        Args:
+            app_name: Filter by app name
+            level: Filter by log level
+        
+        Yields:
+            Log lines as they are written
+        """
+        file_path, error = self._stream_target(app_name)
+        if error:
+            yield error
+            return
+        
+        initial_size = os.path.getsize(file_path)
+        
+        tailer = self._create_tailer(file_path)
+        try:
+            async for _ in tailer.aread():
+                current_size = os.path.getsize(file_path)
                 
-            except Exception as e:
-                yield f"data: Error streaming logs: {str(e)}\n\n"
-                break
+                if current_size > initial_size:
+                    emitter = self._emit_new_lines(file_path, initial_size, current_size, level)
+                    while True:
+                        try:
+                            yield next(emitter)
+                        except StopIteration as done:
+                            initial_size = done.value
+                            break
+        
+        except Exception as e:
+            yield f"data: Error streaming logs: {str(e)}\n\n"
+        finally:
+            tailer.close()
     
     def get_health_status(self) -> Dict:
         """
@@ -379,7 +1467,7 @@ class LogViewerService:
             all_files = self.get_all_log_files()
             
             # Get available apps from log files
-            available_apps = list(set(f['app_name'] for f in all_files['log_files'] if f['app_name']))
+            available_apps = self.get_available_apps()
             
             return {
                 'status': 'healthy',
@@ -399,6 +1487,207 @@ class LogViewerService:
                 'directory_exists': os.path.exists(self.log_dir) if self.log_dir else False
             }
     
+    @_log_dir_memoize
+    def _scan_log_dir(self) -> tuple:
+        """
+        List the log directory in a single os.scandir pass.
+        
+        DirEntry caches the file type, so this costs one stat per log file
+        and nothing for other entries. App names are collected during the
+        same pass.
+        
+        Returns:
+            Tuple of (log_files newest first, total_size, sorted app names)
+        """
+        scanned = []
+        total_size = 0
+        apps = set()
+        
+        # Get all log files (including rotated ones)
+        with os.scandir(self.log_dir) as entries:
+            for entry in entries:
+                if not self._is_log_entry(entry):
+                    continue
+                stat = entry.stat()
+                file_name = entry.name
+                
+                # Extract app name and date from filename
+                app_name, date = self._parse_log_filename(file_name)
+                if app_name:
+                    apps.add(app_name)
+                
+                scanned.append((stat.st_mtime, {
+                    'name': file_name,
+                    'path': entry.path,
+                    'size': stat.st_size,
+                    'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                    'app_name': app_name,
+                    'date': date,
+                    'size_mb': round(stat.st_size / (1024 * 1024), 2)
+                }))
+                total_size += stat.st_size
+        
+        # Sort by modification time (newest first)
+        scanned.sort(key=lambda item: item[0], reverse=True)
+        
+        return [log_file for _, log_file in scanned], total_size, sorted(apps)
+    
+    def _is_log_entry(self, entry: os.DirEntry) -> bool:
+        """
+        Check whether a directory entry is a log file, like glob('*.log*').
+        
+        Args:
+            entry: Entry from os.scandir
+            
+        Returns:
+            True for regular, non-hidden files with '.log' in the name
+        """
+        name = entry.name
+        if name.startswith('.') or '.log' not in name:
+            return False
+        try:
+            return entry.is_file()
+        except OSError:
+            return False
+    
+    def _latest_app_log(self, app_name: str) -> Optional[str]:
+        """
+        Find the current log file of an app.
+        
+        The unrotated '<app_name>.log' is always the newest. Without it, the
+        rotated files are named '<app_name>.log.YYYY-MM-DD', so the greatest
+        name is the newest and no file needs to be stat'ed.
+        
+        Args:
+            app_name: Name of the app
+            
+        Returns:
+            Path of the newest '<app_name>.log*' file, or None if there is none
+        """
+        prefix = f'{app_name}.log'
+        current_path = os.path.join(self.log_dir, prefix)
+        if os.path.isfile(current_path):
+            return current_path
+        
+        latest = None
+        try:
+            with os.scandir(self.log_dir) as entries:
+                for entry in entries:
+                    if not entry.name.startswith(prefix) or not self._is_log_entry(entry):
+                        continue
+                    if latest is None or entry.name > latest.name:
+                        latest = entry
+        except OSError:
+            return None
+        
+        return latest.path if latest else None
+    
+    def _parse_date_range(self, start_date: str, end_date: str) -> tuple:
+        """
+        Parse YYYY-MM-DD date filters, ignoring invalid values.
+        
+        Args:
+            start_date: Start date filter
+            end_date: End date filter, inclusive of the whole day
+            
+        Returns:
+            Tuple of (start_dt, end_dt), either of which may be None
+        """
+        start_dt = None
+        end_dt = None
+        if start_date:
+            try:
+                start_dt = datetime.strptime(start_date, '%Y-%m-%d')
+            except ValueError:
+                pass
+        if end_date:
+            try:
+                end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+                end_dt = end_dt.replace(hour=23, minute=59, second=59)
+            except ValueError:
+                pass
+        return start_dt, end_dt
+    
+    def _iter_tail_file(
+        self,
+        file_path: str,
+        lines: int,
+        level: str,
+        search: str,
+        start_dt: Optional[datetime],
+        end_dt: Optional[datetime]
+    ) -> Generator[Dict, None, None]:
+        """
+        Yield up to `lines` matching entries of a file, scanning from the end.
+        
+        Args:
+            file_path: Path of the log file
+            lines: Maximum number of entries to yield
+            level: Filter by log level
+            search: Search term in log messages
+            start_dt: Oldest timestamp to include
+            end_dt: Newest timestamp to include
+            
+        Yields:
+            Parsed entries, newest first
+        """
+        # Tail reads walk backwards, which sequential read-ahead does not help
+        with _map_log_file(file_path, sequential=False) as buf:
+            yield from self._iter_tail_entries(buf, None, lines, level, search, start_dt, end_dt)
+    
+    def _iter_tail_entries(
+        self,
+        buf,
+        line_count: Optional[int],
+        lines: int,
+        level: str,
+        search: str,
+        start_dt: Optional[datetime],
+        end_dt: Optional[datetime]
+    ) -> Generator[Dict, None, None]:
+        """
+        Yield up to `lines` matching entries of a buffer, scanning from the end.
+        
+        Args:
+            buf: Mapped log file
+            line_count: Number of lines in buf, if already counted
+            lines: Maximum number of entries to yield
+            level: Filter by log level
+            search: Search term in log messages
+            start_dt: Oldest timestamp to include
+            end_dt: Newest timestamp to include
+            
+        Yields:
+            Parsed entries, newest first
+        """
+        if lines < 1:
+            return
+        
+        pattern = _compiled_filter(level, search)
+        level_bytes = f' {level} '.encode() if level else b''
+        remaining = lines
+        
+        for line_num, i, j in _reverse_line_spans(buf, line_count):
+            if level_bytes and buf.find(level_bytes, i, min(j, i + _LEVEL_SCAN_BYTES)) < 0:
+                continue
+            
+            line = buf[i:j].decode('utf-8', 'ignore').strip()
+            if not line:
+                continue
+            
+            match = pattern.match(line)
+            if not match:
+                continue
+            
+            if (start_dt or end_dt) and not self._in_date_range(match.group('timestamp'), start_dt, end_dt):
+                continue
+            
+            yield _log_entry(line_num, line, match)
+            
+            remaining -= 1
+            if not remaining:
+                return
+    
     def _parse_log_filename(self, filename: str) -> tuple:
         """
         Parse log filename to extract app name and date.
@@ -421,6 +1710,23 @@ class LogViewerService:
         
         return app_name, date
     
+    def _parse_rotation_date(self, date: str):
+        """
+        Parse the date suffix of a rotated log file.
+        
+        Args:
+            date: Date part returned by _parse_log_filename
+            
+        Returns:
+            The date, or None when the suffix is empty or not a YYYY-MM-DD date
+        """
+        if not date:
+            return None
+        try:
+            return datetime.strptime(date, '%Y-%m-%d').date()
+        except ValueError:
+            return None
+    
     def _parse_log_line(self, line: str) -> Optional[Dict]:
         """
         Parse a log line to extract components.
@@ -466,16 +1772,124 @@ class LogViewerService:
             return False
         
         # Date filters
-        if start_dt or end_dt:
+        if (start_dt or end_dt) and not self._in_date_range(parsed['timestamp'], start_dt, end_dt):
+            return False
+        
+        return True
+    
+    def _in_date_range(
+        self,
+        timestamp: str,
+        start_dt: Optional[datetime] = None,
+        end_dt: Optional[datetime] = None
+    ) -> bool:
+        """
+        Check a log timestamp against optional date bounds.
+        
+        Args:
+            timestamp: Timestamp field of a log line
+            start_dt: Start date filter
+            end_dt: End date filter
+            
+        Returns:
+            True if the timestamp is within the bounds or cannot be parsed
+        """
+        # Standard timestamps are compared as strings, skipping strptime
+        if _STANDARD_TIMESTAMP.fullmatch(timestamp):
+            start_ts, end_ts = _timestamp_bounds(start_dt, end_dt)
+            return not ((start_ts and timestamp < start_ts) or (end_ts and timestamp > end_ts))
+        
+        try:
+            log_dt = datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S,%f')
+        except ValueError:
+            # If we can't parse the timestamp, skip date filtering
+            return True
+        
+        if start_dt and log_dt < start_dt:
+            return False
+        if end_dt and log_dt > end_dt:
+            return False
+        return True
+    
+    def _stream_target(self, app_name: str = '') -> Tuple[Optional[str], str]:
+        """
+        Resolve the log file to stream for an app.
+        
+        Args:
+            app_name: App name, or empty for the main log file
+        
+        Returns:
+            Tuple of (file path, error event); the error is empty on success
+        """
+        # Find the current log file for the app
+        if app_name:
+            file_path = self._latest_app_log(app_name)
+            if not file_path:
+                return None, f"data: No logs found for app '{app_name}'\n\n"
+        else:
+            # Stream from main log file
+            file_path = os.path.join(self.log_dir, 'ocmcore.log')
+            if not os.path.exists(file_path):
+                return None, "data: No main log file found\n\n"
+        return file_path, ''
+    
+    def _create_tailer(self, file_path: str):
+        """
+        Create a tailer that wakes up when the file may have new data.
+        
+        Uses inotify where available and falls back to polling once a second.
+        
+        Args:
+            file_path: Path of the file to watch
+            
+        Returns:
+            Tailer instance exposing read(), aread() and close()
+        """
+        if INotify is not None:
             try:
-                log_dt = datetime.strptime(parsed['timestamp'], '%Y-%m-%d %H:%M:%S,%f')
-                
-                if start_dt and log_dt < start_dt:
-                    return False
-                if end_dt and log_dt > end_dt:
-                    return False
-            except ValueError:
-                # If we can't parse the timestamp, skip date filtering
+                return _InotifyTailer(file_path)
+            except OSError:
+                # Watch limit reached or filesystem without inotify support
                 pass
+        return _PollingTailer(file_path)
+    
+    def _emit_new_lines(
+        self,
+        file_path: str,
+        start: int,
+        end: int,
+        level: str = ''
+    ) -> Generator[str, None, int]:
+        """
+        Yield server-sent event lines for complete log lines appended to a file.
+        
+        Args:
+            file_path: Path of the log file
+            start: Byte offset already streamed
+            end: Current file size
+            level: Filter by log level
+            
+        Yields:
+            Formatted event lines
+            
+        Returns:
+            Byte offset to resume from (just past the last complete line)
+        """
+        with open(file_path, 'rb') as f:
+            f.seek(start)
+            new_content = f.read(end - start)
+        
+        # Leave a partially written trailing line for the next read
+        complete = new_content.rfind(b'\n') + 1
+        if not complete:
+            return start
+        
+        # The level is part of the pattern, so lines are matched without
+        # building a dict and comparing its level field
+        pattern = _compiled_filter(level)
+        for _, line in _LineScanner(new_content[:complete], level):
+            stripped = line.strip()
+            if stripped and pattern.match(stripped):
+                yield f"data: {line}\n\n"
         
-        return True 
\ No newline at end of file
+        return start + complete
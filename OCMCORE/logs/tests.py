@@ -2,12 +2,32 @@
 Tests for logs app.
 """
 
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
+from logs import services, views
 from logs.models import ExampleModel
-from logs.services import create_example_record, get_example_data
+from logs.services import LogViewerService
+
+
+def _log_line(level, minutes_ago, message):
+    """Format a log record the way the LOGGING formatters write them"""
+    timestamp = datetime.now() - timedelta(minutes=minutes_ago)
+    return f"[{timestamp:%Y-%m-%d %H:%M:%S},{timestamp.microsecond // 1000:03d}] {level} logs.views 1 2 {message}\n"
+
+
+def _write_log(path, records, mode='w'):
+    """Write (level, minutes_ago, message) records to a log file, oldest first"""
+    with open(path, mode) as f:
+        f.writelines(_log_line(*record) for record in records)
 
 
 class LogsModelTests(TestCase):
@@ -33,61 +53,199 @@ class LogsModelTests(TestCase):
         self.assertEqual(str(self.example), "Test Example")
 
 
-class LogsAPITests(APITestCase):
+class LogDirTestMixin:
+    """
+    Give each test its own log directory and statistics index.
+    """
+    
+    def setUp(self):
+        """Set up test data"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_dir = os.path.join(self.tmp_dir, 'logs')
+        os.makedirs(self.log_dir)
+        self.log_path = os.path.join(self.log_dir, 'app.log')
+        
+        # Fifty records a minute apart, every fifth an ERROR, newest last
+        self.records = [
+            ('ERROR' if i % 5 == 0 else 'INFO', 50 - i, f'message {i}')
+            for i in range(50)
+        ]
+        _write_log(self.log_path, self.records)
+        
+        settings_override = override_settings(
+            LOG_DIR=self.log_dir,
+            LOG_STATS_INDEX=os.path.join(self.tmp_dir, 'stats.sqlite')
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        
+        # Memoized results are module-level and keyed on paths and mtimes
+        services._memo.clear()
+        services._file_stats_memo.clear()
+        self.service = LogViewerService()
+    
+    def tearDown(self):
+        """Clean up test data"""
+        services._memo.clear()
+        services._file_stats_memo.clear()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def forget_memoized_stats(self):
+        """Drop in-process statistics so the next request goes to the index"""
+        services._memo.clear()
+        services._file_stats_memo.clear()
+
+
+class LogsAPITests(LogDirTestMixin, APITestCase):
     """
     Tests for logs API endpoints.
     """
     
     def setUp(self):
         """Set up test data"""
-        self.example = create_example_record("API Test Example", "API Test Description")
+        super().setUp()
+        service_patch = mock.patch.object(views, '_SERVICE', self.service)
+        service_patch.start()
+        self.addCleanup(service_patch.stop)
     
     def test_health_check(self):
         """Test health check endpoint"""
-        url = reverse('logs-health')
+        url = reverse('log-health')
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data['app'], 'logs')
     
-    def test_example_get(self):
-        """Test example GET endpoint"""
-        url = reverse('logs-example')
-        response = self.client.get(url)
+    def test_stats_negative_days(self):
+        """Test a negative window returns empty daily stats instead of failing"""
+        url = reverse('log-stats')
+        response = self.client.get(url, {'days': -3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)['daily_stats'], [])
+    
+    def test_stats_non_numeric_days(self):
+        """Test a non-numeric window falls back to the default"""
+        url = reverse('log-stats')
+        response = self.client.get(url, {'days': 'week'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertEqual(data['analyzed_days'], 7)
+        self.assertEqual(data['total_log_entries'], 50)
+    
+    def test_content_ndjson_stream(self):
+        """Test streamed content is one JSON entry per line, newest first"""
+        url = reverse('log-content', args=['app.log'])
+        response = self.client.get(url, {'stream': '1', 'level': 'ERROR', 'lines': 4})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        
+        entries = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([entry['message'] for entry in entries],
+                         ['message 45', 'message 40', 'message 35', 'message 30'])
+    
+    def test_content_streamed_json_matches_service(self):
+        """Test large JSON results are streamed as the same document"""
+        _write_log(self.log_path, [('INFO', 0, f'extra {i}') for i in range(300)], mode='a')
+        url = reverse('log-content', args=['app.log'])
+        response = self.client.get(url, {'level': 'INFO', 'lines': 250})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn('data', response.data)
-    
-    def test_example_post_valid(self):
-        """Test example POST endpoint with valid data"""
-        url = reverse('logs-example')
-        data = {
-            'name': 'New Example',
-            'description': 'New Description'
-        }
-        response = self.client.post(url, data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-    
-    def test_example_post_invalid(self):
-        """Test example POST endpoint with invalid data"""
-        url = reverse('logs-example')
-        data = {}  # Empty data
-        response = self.client.post(url, data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.streaming)
+        
+        document = json.loads(b''.join(response.streaming_content))
+        expected = self.service.get_log_content(filename='app.log', lines=250, level='INFO')
+        self.assertEqual(document, json.loads(json.dumps(expected)))
+        self.assertEqual(document['filtered_lines'], 250)
 
 
-class LogsServiceTests(TestCase):
+class LogsServiceTests(LogDirTestMixin, TestCase):
     """
     Tests for logs services.
     """
     
-    def test_create_example_record(self):
-        """Test creating example record"""
-        record = create_example_record("Service Test", "Service Description")
-        self.assertEqual(record.name, "Service Test")
-        self.assertEqual(record.description, "Service Description")
-    
-    def test_get_example_data(self):
-        """Test getting example data"""
-        create_example_record("Data Test", "Data Description")
-        data = get_example_data()
-        self.assertIsInstance(data, list)
-        self.assertGreater(len(data), 0)
+    def test_statistics_skip_unparsable_records(self):
+        """Test statistics count only records the content parser accepts"""
+        yesterday = datetime.now() - timedelta(days=1)
+        with open(self.log_path, 'a') as f:
+            # A blank message, and a time of day that does not exist
+            f.write(_log_line('ERROR', 0, ''))
+            f.write(f"[{yesterday:%Y-%m-%d} 23:61:00,000] ERROR logs.views 1 2 late\n")
+        
+        stats = self.service.get_log_statistics(days=2)
+        self.assertEqual(stats['total_log_entries'], 50)
+        self.assertEqual(stats['level_distribution'], {'ERROR': 10, 'INFO': 40})
+    
+    def test_filtered_lines_counts_returned_entries(self):
+        """Test filtered_lines is the number of entries returned"""
+        filtered = self.service.get_log_content(filename='app.log', lines=3, level='ERROR')
+        self.assertEqual(filtered['filtered_lines'], 3)
+        self.assertEqual([entry['message'] for entry in filtered['content']],
+                         ['message 45', 'message 40', 'message 35'])
+    
+    def test_tail_reads_newest_first(self):
+        """Test the tail keeps the last entries, newest first"""
+        tail = self.service.tail_log_content(filename='app.log', lines=4)
+        self.assertEqual([entry['line_number'] for entry in tail['content']], [50, 49, 48, 47])
+        self.assertEqual(tail['filtered_lines'], 4)
+        self.assertEqual(tail['total_lines'], 50)
+    
+    def test_reverse_tail_matches_forward_scan(self):
+        """Test reading backwards from the end finds the same entries as a full scan"""
+        # No trailing newline, so the last record is a partial line
+        with open(self.log_path, 'a') as f:
+            f.write(_log_line('ERROR', 0, 'last').rstrip('\n'))
+        
+        forward = self.service.get_log_content(filename='app.log', lines=6, level='ERROR')['content']
+        backward = list(self.service.iter_log_content(filename='app.log', lines=6, level='ERROR'))
+        self.assertEqual(backward, forward)
+        self.assertEqual(backward[0]['message'], 'last')
+    
+    def test_statistics_negative_days(self):
+        """Test windows ending before they start count nothing"""
+        for days in (-5, -2, -1, 0):
+            stats = self.service.get_log_statistics(days=days)
+            self.assertEqual(stats['daily_stats'], [])
+    
+    def test_statistics_resume_from_index(self):
+        """Test appended entries are added to the indexed counts"""
+        stats = self.service.get_log_statistics(days=2)
+        self.assertEqual(stats['level_distribution'], {'ERROR': 10, 'INFO': 40})
+        
+        indexed_size = os.path.getsize(self.log_path)
+        _write_log(self.log_path, [('WARNING', 0, f'appended {i}') for i in range(5)], mode='a')
+        self.forget_memoized_stats()
+        with mock.patch.object(services, '_file_stats', wraps=services._file_stats) as file_stats:
+            stats = self.service.get_log_statistics(days=2)
+        self.assertEqual(stats['level_distribution'], {'ERROR': 10, 'INFO': 40, 'WARNING': 5})
+        
+        # Only the appended part was parsed
+        self.assertEqual([call.args[3] for call in file_stats.call_args_list], [indexed_size])
+    
+    def test_statistics_copytruncate_not_resumed(self):
+        """Test a file truncated in place and written again is counted afresh"""
+        self.service.get_log_statistics(days=2)
+        inode = os.stat(self.log_path).st_ino
+        
+        # Truncate in place, then grow past the indexed size
+        with open(self.log_path, 'r+') as f:
+            f.truncate(0)
+        _write_log(self.log_path, [('INFO', 0, f'rotated {i}') for i in range(80)], mode='a')
+        self.assertEqual(os.stat(self.log_path).st_ino, inode)
+        
+        self.forget_memoized_stats()
+        stats = self.service.get_log_statistics(days=2)
+        self.assertEqual(stats['level_distribution'], {'INFO': 80})
+    
+    def test_statistics_default_index_location(self):
+        """Test the default index is kept out of the log directory listing"""
+        with override_settings():
+            from django.conf import settings
+            del settings.LOG_STATS_INDEX
+            self.service.get_log_statistics(days=2)
+            index_path = os.path.join(self.log_dir, '.index', 'stats.sqlite')
+            self.assertTrue(os.path.exists(index_path))
+            
+            # Index writes touch only its own directory, and it is not listed as a log
+            dir_mtime = os.stat(self.log_dir).st_mtime_ns
+            _write_log(self.log_path, [('INFO', 0, 'appended')], mode='a')
+            self.forget_memoized_stats()
+            self.service.get_log_statistics(days=2)
+            self.assertEqual(os.stat(self.log_dir).st_mtime_ns, dir_mtime)
+            self.assertEqual(self.service.get_log_file_names(), {'app.log'})
@@ -3,30 +3,149 @@ Log viewing views for logs app.
 """
 
 import os
-import glob
-import re
-from datetime import datetime, timedelta
-from pathlib import Path
-from typing import List, Dict, Optional
+from datetime import datetime, timezone
+from typing import Dict, Optional
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.decorators import action
-from rest_framework.viewsets import ViewSet
-from django.conf import settings
-from django.http import StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, StreamingHttpResponse
+from django.shortcuts import render
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date
+from django.views.decorators.cache import cache_page
+from django.views.decorators.http import condition
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
+from logs.renderers import ORJSONRenderer, PlainTextRenderer
 from logs.services import LogViewerService
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+    import json
+
+
+# Shared by all views and request threads. LogViewerService holds no
+# per-request state; its memoized listings and statistics live in module
+# dicts that are only updated with single, atomic dict operations.
+_SERVICE = LogViewerService()
+
+
+def _parse_int(query_params, name: str, default: int, lo: int, hi: int) -> int:
+    """
+    Parse an integer query parameter and clamp it to [lo, hi].
+    
+    Args:
+        query_params: Request query parameters
+        name: Parameter name
+        default: Value used when the parameter is missing or not an integer
+        lo: Smallest allowed value
+        hi: Largest allowed value
+        
+    Returns:
+        The clamped integer
+    """
+    try:
+        value = int(query_params.get(name, default))
+    except (TypeError, ValueError):
+        value = default
+    return max(lo, min(hi, value))
+
+
+# Filtered JSON responses above this many lines are encoded incrementally
+_STREAM_JSON_MIN_LINES = 200
+
+# Size of the chunks a streamed JSON document is written in
+_STREAM_JSON_CHUNK_BYTES = 64 * 1024
+
+
+def _json_document(document: Dict, stream_key: str = 'content'):
+    """
+    Encode a dict as one JSON document, one item of a list value at a time.
+    
+    The output is the same document the JSON renderer would produce, but
+    only a chunk of it is held in memory at any point.
+    
+    Args:
+        document: Dict to encode
+        stream_key: Key whose iterable value is encoded item by item
+        
+    Yields:
+        Chunks of the encoded document
+    """
+    def dumps(value) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(value)
+        return json.dumps(value).encode()
+    
+    chunk = bytearray(b'{')
+    for n, (key, value) in enumerate(document.items()):
+        if n:
+            chunk += b','
+        chunk += dumps(key) + b':'
+        
+        if key != stream_key:
+            chunk += dumps(value)
+            continue
+        
+        chunk += b'['
+        for i, item in enumerate(value):
+            if i:
+                chunk += b','
+            chunk += dumps(item)
+            if len(chunk) >= _STREAM_JSON_CHUNK_BYTES:
+                yield bytes(chunk)
+                chunk.clear()
+        chunk += b']'
+    
+    chunk += b'}'
+    yield bytes(chunk)
+
+
+def _log_dir_last_modified(request, *args, **kwargs) -> Optional[datetime]:
+    """
+    Last-Modified value for pages built from the log directory listing.
+    
+    The directory mtime changes whenever a log file is added, rotated or
+    removed, which is all the listing depends on.
+    
+    Returns:
+        Modification time of the log directory, or None if it is missing
+    """
+    try:
+        return datetime.fromtimestamp(os.stat(_SERVICE.log_dir).st_mtime, tz=timezone.utc)
+    except OSError:
+        return None
+
+
+def _ndjson_lines(entries):
+    """
+    Encode entries as newline-delimited JSON.
+    
+    Args:
+        entries: Iterable of JSON-serializable dicts
+        
+    Yields:
+        One encoded line per entry
+    """
+    for entry in entries:
+        if orjson is not None:
+            yield orjson.dumps(entry) + b'\n'
+        else:
+            yield json.dumps(entry).encode() + b'\n'
+
 
 class LogFilesView(APIView):
     """
     API view for listing available log files.
     """
     
+    renderer_classes = [ORJSONRenderer]
+    
     @swagger_auto_schema(
         operation_description="List all available log files",
         responses={
@@ -59,7 +178,7 @@ class LogFilesView(APIView):
     def get(self, request):
         """List all available log files."""
         try:
-            service = LogViewerService()
+            service = _SERVICE
             log_files = service.get_all_log_files()
             return Response(log_files)
         except Exception as e:
@@ -74,6 +193,8 @@ class LogContentView(APIView):
     API view for viewing log file content.
     """
     
+    renderer_classes = [ORJSONRenderer, PlainTextRenderer]
+    
     @swagger_auto_schema(
         operation_description="View log file content with optional filtering",
         manual_parameters=[
@@ -119,6 +240,13 @@ class LogContentView(APIView):
                 type=openapi.TYPE_STRING,
                 required=False
             ),
+            openapi.Parameter(
+                'stream',
+                openapi.IN_QUERY,
+                description="Stream matching entries as NDJSON, newest first, read from the end of the file",
+                type=openapi.TYPE_BOOLEAN,
+                required=False
+            ),
         ],
         responses={
             200: openapi.Response(
@@ -163,29 +291,66 @@ class LogContentView(APIView):
     def get(self, request, filename):
         """View log file content with optional filtering."""
         try:
-            service = LogViewerService()
-            
             # Get query parameters
-            lines = int(request.query_params.get('lines', 100))
+            lines = _parse_int(request.query_params, 'lines', 100, 1, 1000)
             level = request.query_params.get('level', '').upper()
             search = request.query_params.get('search', '')
             start_date = request.query_params.get('start_date', '')
             end_date = request.query_params.get('end_date', '')
             
-            # Validate lines parameter
-            if lines > 1000:
-                lines = 1000
-            elif lines < 1:
-                lines = 100
+            service = _SERVICE
             
+            # Only names from the directory listing are served, which rejects
+            # path traversal and missing files before any file is opened
+            if filename not in service.get_log_file_names():
+                raise FileNotFoundError(filename)
+            
+            # Stream entries straight from the end of the file
+            if request.query_params.get('stream', '').lower() in ('1', 'true', 'yes'):
+                entries = service.iter_log_content(
+                    filename=filename,
+                    lines=lines,
+                    level=level,
+                    search=search,
+                    start_date=start_date,
+                    end_date=end_date
+                )
+                response = StreamingHttpResponse(
+                    _ndjson_lines(entries),
+                    content_type='application/x-ndjson'
+                )
+                response['X-Accel-Buffering'] = 'no'
+                return response
+            
+            has_filters = any((level, search, start_date, end_date))
+            
+            # Raw tails are sent straight from the file, which lets the server
+            # use sendfile instead of copying the bytes through Python
+            if not has_filters and request.accepted_renderer.format == 'txt':
+                return FileResponse(
+                    service.open_log_tail(filename=filename, lines=lines),
+                    content_type='text/plain; charset=utf-8'
+                )
+            
+            # Without filters only the tail of the file needs to be read
+            if not has_filters:
+                content = service.tail_log_content(filename=filename, lines=lines)
+                return Response(content)
+            
+            # Large JSON results are encoded entry by entry rather than as
+            # a list of dicts followed by one big encoded body
+            stream_json = request.accepted_renderer.format == 'json' and lines >= _STREAM_JSON_MIN_LINES
             content = service.get_log_content(
                 filename=filename,
                 lines=lines,
                 level=level,
                 search=search,
                 start_date=start_date,
-                end_date=end_date
+                end_date=end_date,
+                lazy=stream_json
             )
+            if stream_json:
+                return StreamingHttpResponse(_json_document(content), content_type='application/json')
             
             return Response(content)
             
@@ -206,6 +371,8 @@ class AppLogsView(APIView):
     API view for viewing logs for specific apps.
     """
     
+    renderer_classes = [ORJSONRenderer]
+    
     @swagger_auto_schema(
         operation_description="View logs for a specific app",
         manual_parameters=[
@@ -246,18 +413,12 @@ class AppLogsView(APIView):
     def get(self, request, app_name):
         """View logs for a specific app."""
         try:
-            service = LogViewerService()
-            
             # Get query parameters
-            lines = int(request.query_params.get('lines', 100))
+            lines = _parse_int(request.query_params, 'lines', 100, 1, 1000)
             level = request.query_params.get('level', '').upper()
             date = request.query_params.get('date', 'latest')
             
-            # Validate lines parameter
-            if lines > 1000:
-                lines = 1000
-            elif lines < 1:
-                lines = 100
+            service = _SERVICE
             
             content = service.get_app_logs(
                 app_name=app_name,
@@ -285,6 +446,8 @@ class LogStatsView(APIView):
     API view for log statistics and analytics.
     """
     
+    renderer_classes = [ORJSONRenderer]
+    
     @swagger_auto_schema(
         operation_description="Get log statistics and analytics",
         manual_parameters=[
@@ -345,10 +508,10 @@ class LogStatsView(APIView):
     def get(self, request):
         """Get log statistics and analytics."""
         try:
-            service = LogViewerService()
+            service = _SERVICE
             
             app_name = request.query_params.get('app_name', '')
-            days = int(request.query_params.get('days', 7))
+            days = _parse_int(request.query_params, 'days', 7, 0, 365)
             
             stats = service.get_log_statistics(app_name=app_name, days=days)
             return Response(stats)
@@ -390,13 +553,20 @@ class RealTimeLogsView(APIView):
     def get(self, request):
         """Stream real-time logs."""
         try:
-            service = LogViewerService()
+            service = _SERVICE
             
             app_name = request.query_params.get('app_name', '')
             level = request.query_params.get('level', '').upper()
             
+            # Under ASGI stream from an async generator so waiting for new
+            # lines happens on the event loop instead of pinning a thread
+            if isinstance(request._request, ASGIRequest):
+                events = service.astream_logs(app_name=app_name, level=level)
+            else:
+                events = service.stream_logs(app_name=app_name, level=level)
+            
             response = StreamingHttpResponse(
-                service.stream_logs(app_name=app_name, level=level),
+                events,
                 content_type='text/plain'
             )
             response['Cache-Control'] = 'no-cache'
@@ -415,6 +585,8 @@ class LogHealthView(APIView):
     Health check view for logs app.
     """
     
+    renderer_classes = [ORJSONRenderer]
+    
     @swagger_auto_schema(
         operation_description="Health check for logs app",
         responses={
@@ -439,7 +611,7 @@ class LogHealthView(APIView):
     def get(self, request):
         """Health check for logs app."""
         try:
-            service = LogViewerService()
+            service = _SERVICE
             health = service.get_health_status()
             return Response(health)
         except Exception as e:
@@ -457,16 +629,18 @@ class LogWebView(APIView):
     Web interface view for log viewing.
     """
     
+    # Browsers revalidate against the log directory mtime, and the rendered
+    # page is shared between clients for 30 seconds. The page carries the
+    # mtime it was rendered at, so a cached copy is never labelled newer.
+    @method_decorator(condition(last_modified_func=_log_dir_last_modified))
+    @method_decorator(cache_page(30, key_prefix='logweb'))
     def get(self, request):
         """Render the log viewer web interface."""
-        from django.shortcuts import render
-        
         # Get available apps for the dropdown
-        service = LogViewerService()
+        service = _SERVICE
         try:
-            all_files = service.get_all_log_files()
-            available_apps = list(set(f['app_name'] for f in all_files['log_files'] if f['app_name']))
-        except:
+            available_apps = service.get_available_apps()
+        except OSError:
             available_apps = []
         
         context = {
@@ -474,4 +648,8 @@ class LogWebView(APIView):
             'api_base_url': '/api/logs/'
         }
         
-        return render(request, 'logs/log_viewer.html', context)
+        response = render(request, 'logs/log_viewer.html', context)
+        last_modified = _log_dir_last_modified(request)
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        return response
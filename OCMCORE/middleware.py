@@ -1,36 +1,74 @@
+import atexit
 import logging
+import queue
 import time
+from logging.handlers import QueueHandler, QueueListener
 
 logger = logging.getLogger('django.request')
 
+
+def _start_queue_logging(target):
+    """
+    Move a logger's handlers behind a queue drained by a background thread.
+
+    The request thread then only enqueues records; formatting and file I/O
+    happen in the listener thread, which is flushed at interpreter exit.
+    Does nothing if the logger has no handlers or is already queued.
+    """
+    handlers = list(target.handlers)
+    if not handlers or any(isinstance(h, QueueHandler) for h in handlers):
+        return None
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        target.removeHandler(handler)
+    target.addHandler(QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+# Django configures logging before middleware modules are imported
+_listener = _start_queue_logging(logger)
+
+# Bound once so the per-request path skips attribute lookups. perf_counter
+# is monotonic and the highest-resolution clock available.
+_now = time.perf_counter
+_enabled = logger.isEnabledFor
+
 class RequestLoggingMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        start = time.time()
+        # Skip timing and request inspection entirely when nothing is logged
+        if not _enabled(logging.INFO):
+            return self.get_response(request)
+
+        start = _now()
         response = self.get_response(request)
-        duration = time.time() - start
+        duration = _now() - start
 
         # Get user info
-        user = getattr(request, 'user', None)
-        if user and hasattr(user, 'is_authenticated'):
-            user_str = user.username if user.is_authenticated else 'anon'
-        else:
+        try:
+            user_str = request.user.username if request.user.is_authenticated else 'anon'
+        except AttributeError:
             user_str = 'anon'
 
-        # Get IP address (prefer X-Forwarded-For if present)
-        ip = (
-            request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')[0].strip()
-            if request.META.get('HTTP_X_FORWARDED_FOR')
-            else request.META.get('REMOTE_ADDR')
-        )
+        # Get IP address (prefer the first X-Forwarded-For hop if present)
+        meta = request.META
+        xff = meta.get('HTTP_X_FORWARDED_FOR')
+        ip = xff.partition(',')[0].strip() if xff else meta.get('REMOTE_ADDR')
 
+        # Arguments are only formatted if a handler emits the record
         logger.info(
-            f"{request.method} {request.get_full_path()} "
-            f"status={response.status_code} "
-            f"user={user_str} "
-            f"ip={ip} "
-            f"duration={duration:.3f}s"
+            "%s %s status=%s user=%s ip=%s duration=%.3fs",
+            request.method,
+            request.get_full_path(),
+            response.status_code,
+            user_str,
+            ip,
+            duration
         )
         return response 
\ No newline at end of file
@@ -2,50 +2,241 @@
 Simple Memcached Cache with Docker support, key tracking, and async dump/load functionality
 """
 
+import atexit
 import json
-import time
 import asyncio
+import contextvars
 import os
 import pickle
 import threading
-import shutil
 import re
+import sys
+import zlib
 from typing import Any, Dict, Optional, List
 from datetime import datetime
+from functools import lru_cache
 from django.core.cache import cache
-import inspect
 import importlib
+import logging
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Django and third-party apps, which never own cache keys
+_NON_LOCAL_APPS = frozenset({
+    'django.contrib.admin', 'django.contrib.auth', 'django.contrib.contenttypes',
+    'django.contrib.sessions', 'django.contrib.messages', 'django.contrib.staticfiles',
+    'rest_framework', 'drf_yasg', 'corsheaders'})
 
 # Dynamically load local apps from settings.py
 try:
     settings = importlib.import_module('settings')
     INSTALLED_APPS = getattr(settings, 'INSTALLED_APPS', [])
     # Filter out Django and third-party apps
-    LOCAL_APPS = [app for app in INSTALLED_APPS if app not in [
-        'django.contrib.admin', 'django.contrib.auth', 'django.contrib.contenttypes',
-        'django.contrib.sessions', 'django.contrib.messages', 'django.contrib.staticfiles',
-        'rest_framework', 'drf_yasg', 'corsheaders']]
+    LOCAL_APPS = [app for app in INSTALLED_APPS if app not in _NON_LOCAL_APPS]
 except Exception:
     LOCAL_APPS = ['attribution', 'cache']  # fallback
 
 
+@lru_cache(maxsize=256)
+def _compile(pattern):
+    """Compile a key pattern, reusing the compiled object for repeated patterns"""
+    return re.compile(pattern)
+
+
+# Characters that end the literal text at the start of a pattern
+_REGEX_SPECIAL = frozenset('.^$*+?{}[]()|\\')
+
+
+@lru_cache(maxsize=256)
+def _literal_prefix(pattern):
+    """Split a pattern into (anchored, leading literal text, whether the pattern is only that text)"""
+    if '|' in pattern:
+        # An alternation can match without the leading text
+        return False, '', False
+    anchored = pattern.startswith('^')
+    start = end = 1 if anchored else 0
+    while end < len(pattern) and pattern[end] not in _REGEX_SPECIAL:
+        end += 1
+    if end == len(pattern):
+        return anchored, pattern[start:], True
+    if pattern[end] in '*?{' and end > start:
+        # The quantifier makes the last literal character optional
+        end -= 1
+    return anchored, pattern[start:end], False
+
+
+# Matches every "/<app>/" directory in a path in one scan. The lookahead
+# keeps matches from consuming the separators, so nested app directories
+# are all found.
+_APP_PATTERN = re.compile(
+    '(?=/(' + '|'.join(re.escape(app) for app in LOCAL_APPS) + ')/)'
+) if LOCAL_APPS else None
+
+# The key registry is stored in Memcached split across this many shards
+# ("<registry key>:<n>"), so a change rewrites one small shard rather than
+# the whole registry. Must be a power of two.
+_REGISTRY_SHARDS = 64
+
+
+def _registry_shard(key):
+    return zlib.crc32(key.encode()) & (_REGISTRY_SHARDS - 1)
+
+
+def _registry_shard_keys(registry_key):
+    return [f"{registry_key}:{shard}" for shard in range(_REGISTRY_SHARDS)]
+
+
+def _read_registry(registry_key):
+    """
+    Read a registry from its shards, falling back to the older single-key layout.
+    
+    Returns a (keys, legacy) tuple; legacy is True when the keys came from the
+    older layout and still need to be written as shards.
+    """
+    shards = cache.get_many(_registry_shard_keys(registry_key))
+    if shards:
+        return set().union(*shards.values()), False
+    keys = cache.get(registry_key)
+    return (set(keys), True) if keys else (set(), False)
+
+
+class _KeyRegistry:
+    """
+    Set of tracked cache keys split into stripes, each behind its own lock.
+    
+    Stripes follow the Memcached registry shards, so writing a shard reads
+    one stripe instead of scanning every key, and a snapshot or pattern scan
+    only holds one stripe's lock at a time.
+    """
+    
+    def __init__(self, keys=()):
+        self._stripes = [set() for _ in range(_REGISTRY_SHARDS)]
+        self._locks = [threading.Lock() for _ in range(_REGISTRY_SHARDS)]
+        self.update(keys)
+    
+    def _by_stripe(self, keys) -> Dict[int, List[str]]:
+        groups = {}
+        for key in keys:
+            groups.setdefault(_registry_shard(key), []).append(key)
+        return groups
+    
+    def add(self, key) -> bool:
+        """Add a key, returning whether it was new"""
+        shard = _registry_shard(key)
+        stripe = self._stripes[shard]
+        with self._locks[shard]:
+            if key in stripe:
+                return False
+            stripe.add(key)
+            return True
+    
+    def update(self, keys) -> List[str]:
+        """Add keys, returning those that were new"""
+        added = []
+        for shard, group in self._by_stripe(keys).items():
+            stripe = self._stripes[shard]
+            with self._locks[shard]:
+                new_keys = set(group).difference(stripe)
+                stripe.update(new_keys)
+            added.extend(new_keys)
+        return added
+    
+    def discard_many(self, keys) -> List[str]:
+        """Remove keys, returning those that were present"""
+        removed = []
+        for shard, group in self._by_stripe(keys).items():
+            stripe = self._stripes[shard]
+            with self._locks[shard]:
+                present = stripe.intersection(group)
+                stripe.difference_update(present)
+            removed.extend(present)
+        return removed
+    
+    def shard(self, shard) -> List[str]:
+        """Snapshot of the keys in one shard"""
+        with self._locks[shard]:
+            return list(self._stripes[shard])
+    
+    def snapshot(self) -> List[str]:
+        """Copy of every tracked key"""
+        # Copy one stripe at a time so writers to other stripes never wait,
+        # and only for as long as the copy takes
+        keys = []
+        for shard, stripe in enumerate(self._stripes):
+            with self._locks[shard]:
+                keys.extend(stripe)
+        return keys
+    
+    def clear(self) -> None:
+        for shard, stripe in enumerate(self._stripes):
+            with self._locks[shard]:
+                stripe.clear()
+    
+    def __contains__(self, key) -> bool:
+        return key in self._stripes[_registry_shard(key)]
+    
+    def __len__(self) -> int:
+        return sum(len(stripe) for stripe in self._stripes)
+    
+    def __iter__(self):
+        return iter(self.snapshot())
+
+
+# App owning each source file seen on a calling stack (None for no app)
+_APP_BY_FILE: Dict[str, Optional[str]] = {}
+_MODULE_GLOBALS = globals()
+
+# Calling app pinned for work handed off to another thread, whose stack no
+# longer reaches the app's frames
+_PINNED_APP: contextvars.ContextVar = contextvars.ContextVar('simple_cache_pinned_app', default=None)
+
+
+def _app_for_file(path):
+    if _APP_PATTERN is None:
+        return None
+    # The innermost app directory owns the file
+    apps = _APP_PATTERN.findall(path.replace('\\', '/'))  # works for both Windows and Linux
+    return apps[-1] if apps else None
+
+
 def _get_calling_app():
-    for frame_info in inspect.stack():
-        module = inspect.getmodule(frame_info.frame)
-        if not module or not hasattr(module, '__file__'):
-            continue
-        path = module.__file__
-        for app in LOCAL_APPS:
-            if f'/{app}/' in path.replace('\\', '/'):  # works for both Windows and Linux
+    app = _PINNED_APP.get()
+    if app is not None:
+        return app
+    # Walk the raw frames instead of inspect.stack(), which builds frame
+    # records with source context for the whole stack on every call. This
+    # module's own frames never belong to an app, so step over them with an
+    # identity check before looking files up.
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_globals is _MODULE_GLOBALS:
+        frame = frame.f_back
+    while frame is not None:
+        path = frame.f_globals.get('__file__')
+        if path:
+            try:
+                app = _APP_BY_FILE[path]
+            except KeyError:
+                app = _APP_BY_FILE[path] = _app_for_file(path)
+            if app:
                 return app
+        frame = frame.f_back
     return None
 
 
-def _app_scoped_key(key):
+def _app_scope_prefix():
     app = _get_calling_app()
     if app and app != 'cache':
-        return f"{app}:{key}"
-    return key
+        return f"{app}:"
+    return ''
+
+
+def _app_scoped_key(key):
+    return f"{_app_scope_prefix()}{key}"
 
 
 # Helper to get the app-scoped registry key
@@ -56,6 +247,59 @@ def _app_scoped_registry_key():
     return "cache_key_registry"
 
 
+# Pickled values at least this large are stored zlib-compressed
+_COMPRESS_MIN_BYTES = 4096
+
+# First byte of a stored value. Values stored before the marker existed are
+# bare pickles, which always start with the b'\x80' protocol opcode.
+_RAW_VALUE = b'\x00'
+_ZLIB_VALUE = b'\x01'
+
+
+def _pack(value) -> bytes:
+    data = pickle.dumps(value)
+    if len(data) >= _COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(data, 1)
+        if len(compressed) < len(data):
+            return _ZLIB_VALUE + compressed
+    return _RAW_VALUE + data
+
+
+def _unpack(data: bytes) -> Any:
+    marker = data[:1]
+    if marker == _ZLIB_VALUE:
+        return pickle.loads(zlib.decompress(memoryview(data)[1:]))
+    if marker == _RAW_VALUE:
+        return pickle.loads(memoryview(data)[1:])
+    return pickle.loads(data)
+
+
+# Keys checked per get_many when looking for expired registry entries
+_CLEANUP_BATCH_SIZE = 1000
+
+# A dump rewrites the snapshot once its write-ahead log outgrows it this many times
+_WAL_COMPACT_RATIO = 4
+
+
+def _encode_json(data, indent=False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(data, indent=2).encode()
+    return json.dumps(data, separators=(',', ':')).encode()
+
+
+def _decode_json(data: bytes):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _write_all(fd, data: bytes) -> None:
+    # os.write may write less than it was given
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
 class SimpleCache:
     """Simple Memcached cache with key tracking and async dump/load functionality"""
     
@@ -65,15 +309,37 @@ class SimpleCache:
         self.max_size = max_size or int(os.environ.get('CACHE_MAX_SIZE', '1000'))
         self.auto_dump_interval = auto_dump_interval or int(os.environ.get('CACHE_AUTO_DUMP_INTERVAL', '300'))
         
-        self.key_registry = set()  # Track all keys in memory
+        self.key_registry = _KeyRegistry()  # Track all keys in memory
         self.dump_thread = None
-        self.stop_dump_thread = False
+        self._stop_dump_event = threading.Event()
+        
+        # Registry writes are deferred and batched (see _mark_registry_dirty)
+        self.registry_flush_threshold = int(os.environ.get('CACHE_REGISTRY_FLUSH_THRESHOLD', '100'))
+        self._dirty_registry_shards = {}  # registry key -> changed shard numbers
+        self._registry_mutations = 0
+        self._registry_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        
+        # Auto-dump skips intervals in which the registry did not change
+        self._registry_version = 0  # bumped on every registry change
+        self._dumped_registry_version = None
+        
+        # Between full dumps, registry changes are appended to a write-ahead log
+        # that amends the last snapshot (see dump_cache_sync)
+        self.wal_file = f"{self.dump_file}.wal"
+        self._dumped_keys = None  # keys the snapshot plus log describe; None forces a full dump
+        self._wal_snapshot = None  # timestamp of the snapshot the log amends
+        self._wal_started = False
+        self._dump_lock = threading.Lock()
         
         # Load cache and key registry on startup
         self.load_cache()
         
         # Start automatic periodic dumping
         self.start_auto_dump()
+        
+        # The dump thread is a daemon, so deferred registry writes are flushed at exit
+        atexit.register(self._flush_registry)
     
     def _get_temp_dump_file(self) -> str:
         """Get temporary dump file path"""
@@ -81,56 +347,45 @@ class SimpleCache:
     
     def _atomic_dump_to_file(self, dump_data: Dict) -> bool:
         """Atomically dump data to file to prevent corruption"""
+        temp_file = self._get_temp_dump_file()
         try:
             # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(self.dump_file), exist_ok=True)
-            
-            # Create temporary file path
-            temp_file = self._get_temp_dump_file()
-            
-            # Write to temporary file first
-            with open(temp_file, 'w') as f:
-                json.dump(dump_data, f, indent=2)
+            dump_dir = os.path.dirname(self.dump_file) or '.'
+            os.makedirs(dump_dir, exist_ok=True)
             
-            # Ensure the file is written to disk
-            f.flush()
-            os.fsync(f.fileno())
+            # Encode once and write the bytes straight to the temporary file
+            payload = _encode_json(dump_data, indent=True)
+            fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                _write_all(fd, payload)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
             
-            # Verify the temporary file was written correctly
-            with open(temp_file, 'r') as f:
-                # Try to load the JSON to verify it's valid
-                json.load(f)
-            
-            # If we get here, the temporary file is valid
-            # Now atomically replace the old file with the new one
+            # Keep the previous dump as a single hard-linked backup
+            backup_file = f"{self.dump_file}.backup"
             if os.path.exists(self.dump_file):
-                # Create backup of old file
-                backup_file = f"{self.dump_file}.backup"
-                shutil.copy2(self.dump_file, backup_file)
-                
-                # Remove old backup if it exists
-                old_backup = f"{self.dump_file}.backup.old"
-                if os.path.exists(old_backup):
-                    os.remove(old_backup)
-                
-                # Rename current backup to old backup
-                if os.path.exists(backup_file):
-                    os.rename(backup_file, old_backup)
-            
-            # Move temporary file to final location
-            shutil.move(temp_file, self.dump_file)
+                try:
+                    if os.path.lexists(backup_file):
+                        os.remove(backup_file)
+                    os.link(self.dump_file, backup_file)
+                except OSError:
+                    pass
             
-            # Clean up old backup
-            old_backup = f"{self.dump_file}.backup.old"
-            if os.path.exists(old_backup):
-                os.remove(old_backup)
+            # Atomically replace the old file and persist the rename
+            os.replace(temp_file, self.dump_file)
+            if hasattr(os, 'O_DIRECTORY'):
+                dir_fd = os.open(dump_dir, os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
             
             return True
             
         except Exception as e:
-            print(f"Error in atomic dump: {e}")
+            logger.error("Error in atomic dump: %s", e)
             # Clean up temporary file if it exists
-            temp_file = self._get_temp_dump_file()
             if os.path.exists(temp_file):
                 try:
                     os.remove(temp_file)
@@ -141,64 +396,101 @@ class SimpleCache:
     def get_keys_by_pattern(self, pattern: str) -> List[str]:
         """Get keys matching a regex pattern"""
         try:
-            regex = re.compile(pattern)
-            matching_keys = [key for key in self.key_registry if regex.search(key)]
-            return matching_keys
+            anchored, literal, exact = _literal_prefix(pattern)
+            keys = self.key_registry
+            # Narrow the keys with a plain string test before running the regex,
+            # and skip the regex entirely for literal patterns
+            if literal or exact:
+                if anchored:
+                    keys = [key for key in keys if key.startswith(literal)]
+                else:
+                    keys = [key for key in keys if literal in key]
+                if exact:
+                    return keys
+            return list(filter(_compile(pattern).search, keys))
         except re.error as e:
-            print(f"Invalid regex pattern '{pattern}': {e}")
+            logger.warning("Invalid regex pattern '%s': %s", pattern, e)
             return []
     
+    def get_keys_by_patterns(self, patterns: List[str]) -> Dict[str, List[str]]:
+        """Get keys matching each of several regex patterns in a single pass over the registry"""
+        result = {pattern: [] for pattern in patterns}
+        compiled = []
+        for pattern in result:
+            try:
+                compiled.append((result[pattern], _compile(pattern)))
+            except re.error as e:
+                logger.warning("Invalid regex pattern '%s': %s", pattern, e)
+        
+        # Patterns may overlap, so every pattern is tried against every key
+        for key in self.key_registry:
+            for matching_keys, regex in compiled:
+                if regex.search(key):
+                    matching_keys.append(key)
+        
+        return result
+    
+    def _forget_keys(self, keys) -> None:
+        """Remove keys from the registry with a single registry write"""
+        removed = self.key_registry.discard_many(keys)
+        if removed:
+            self._mark_registry_dirty(removed)
+    
+    def _scan(self, pattern: str):
+        """Match a pattern once and fetch the matches, returning (matching keys, serialized live values)"""
+        matching_keys = self.get_keys_by_pattern(pattern)
+        
+        # Registry keys are already fully scoped, so fetch them all in one
+        # round-trip rather than through the per-key get
+        serialized_values = cache.get_many(matching_keys)
+        
+        # Keys missing from the batch have expired
+        self._forget_keys(set(matching_keys) - serialized_values.keys())
+        
+        return matching_keys, serialized_values
+    
     def get_values_by_pattern(self, pattern: str) -> Dict[str, Any]:
         """Get key-value pairs for keys matching a regex pattern"""
         try:
-            matching_keys = self.get_keys_by_pattern(pattern)
-            result = {}
-            
-            for key in matching_keys:
-                value = self.get(key)
-                if value is not None:  # Only include non-expired keys
-                    result[key] = value
-            
-            return result
+            _, serialized_values = self._scan(pattern)
+            return {key: _unpack(value) for key, value in serialized_values.items()}
         except Exception as e:
-            print(f"Error getting values by pattern '{pattern}': {e}")
+            logger.error("Error getting values by pattern '%s': %s", pattern, e)
             return {}
     
     def delete_keys_by_pattern(self, pattern: str) -> int:
         """Delete all keys matching a regex pattern. Returns number of deleted keys."""
         try:
             matching_keys = self.get_keys_by_pattern(pattern)
-            deleted_count = 0
             
-            for key in matching_keys:
-                if self.delete(key):
-                    deleted_count += 1
+            cache.delete_many(matching_keys)
+            self._forget_keys(matching_keys)
             
-            return deleted_count
+            return len(matching_keys)
         except Exception as e:
-            print(f"Error deleting keys by pattern '{pattern}': {e}")
+            logger.error("Error deleting keys by pattern '%s': %s", pattern, e)
             return 0
     
     def refresh_keys_by_pattern(self, pattern: str, timeout: int = 3600) -> int:
         """Refresh timeout for all keys matching a regex pattern. Returns number of refreshed keys."""
         try:
-            matching_keys = self.get_keys_by_pattern(pattern)
-            refreshed_count = 0
+            _, serialized_values = self._scan(pattern)
             
-            for key in matching_keys:
-                if self.refresh(key, timeout):
-                    refreshed_count += 1
+            # Re-store the live values with the new timeout in one batch
+            if serialized_values:
+                cache.set_many(serialized_values, timeout)
             
-            return refreshed_count
+            return len(serialized_values)
         except Exception as e:
-            print(f"Error refreshing keys by pattern '{pattern}': {e}")
+            logger.error("Error refreshing keys by pattern '%s': %s", pattern, e)
             return 0
     
     def get_pattern_stats(self, pattern: str) -> Dict:
         """Get statistics for keys matching a pattern"""
         try:
-            matching_keys = self.get_keys_by_pattern(pattern)
-            values = self.get_values_by_pattern(pattern)
+            # One scan and one fetch serve both the key and the value figures
+            matching_keys, serialized_values = self._scan(pattern)
+            values = {key: _unpack(value) for key, value in serialized_values.items()}
             
             return {
                 'pattern': pattern,
@@ -209,37 +501,48 @@ class SimpleCache:
                 'active_values': values
             }
         except Exception as e:
-            print(f"Error getting pattern stats for '{pattern}': {e}")
+            logger.error("Error getting pattern stats for '%s': %s", pattern, e)
             return {'error': str(e)}
     
     def start_auto_dump(self):
         """Start automatic periodic dumping"""
+        # Each worker gets its own event so a restart never revives an old thread
+        stop_event = self._stop_dump_event = threading.Event()
+        
         def dump_worker():
-            while not self.stop_dump_thread:
+            # wait() returns as soon as stop_auto_dump sets the event
+            while not stop_event.wait(self.auto_dump_interval):
                 try:
-                    time.sleep(self.auto_dump_interval)
-                    if not self.stop_dump_thread:  # Check again after sleep
-                        success = self.dump_cache_sync()
-                        if success:
-                            print(f"🔄 Auto-dumped cache at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - {len(self.key_registry)} keys")
-                        else:
-                            print(f"❌ Auto-dump failed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+                    # Expiry changes the registry without any cache call, so
+                    # prune it every interval; the cleanup also flushes
+                    self._cleanup_expired_keys()
+                    # Nothing to write when the registry is unchanged
+                    version = self._registry_version
+                    if version == self._dumped_registry_version:
+                        continue
+                    success = self._write_dump()
+                    if success:
+                        self._dumped_registry_version = version
+                        logger.info("🔄 Auto-dumped cache - %s keys", len(self.key_registry))
+                    else:
+                        logger.error("❌ Auto-dump failed")
                 except Exception as e:
-                    print(f"❌ Auto-dump error: {e}")
+                    logger.error("❌ Auto-dump error: %s", e)
         
         if self.auto_dump_interval > 0:
             self.dump_thread = threading.Thread(target=dump_worker, daemon=True)
             self.dump_thread.start()
-            print(f"🚀 Auto-dump started with {self.auto_dump_interval}s interval (from env: CACHE_AUTO_DUMP_INTERVAL)")
+            logger.info("🚀 Auto-dump started with %ss interval (from env: CACHE_AUTO_DUMP_INTERVAL)", self.auto_dump_interval)
         else:
-            print("🛑 Auto-dump disabled (CACHE_AUTO_DUMP_INTERVAL=0)")
+            logger.info("🛑 Auto-dump disabled (CACHE_AUTO_DUMP_INTERVAL=0)")
     
     def stop_auto_dump(self):
         """Stop automatic periodic dumping"""
-        self.stop_dump_thread = True
+        self._stop_dump_event.set()
         if self.dump_thread and self.dump_thread.is_alive():
             self.dump_thread.join(timeout=5)
-        print("🛑 Auto-dump stopped")
+        self._flush_registry()
+        logger.info("🛑 Auto-dump stopped")
     
     def set_auto_dump_interval(self, interval_seconds: int):
         """Change auto-dump interval"""
@@ -249,68 +552,85 @@ class SimpleCache:
         if old_interval != interval_seconds:
             # Restart auto-dump with new interval
             self.stop_auto_dump()
-            self.stop_dump_thread = False
             self.start_auto_dump()
-            print(f"⏰ Auto-dump interval changed to {interval_seconds}s")
+            logger.info("⏰ Auto-dump interval changed to %ss", interval_seconds)
     
     def set(self, key: str, value: Any, timeout: int = 3600) -> None:
         """Set a key-value pair in Memcached cache"""
+        key = _app_scoped_key(key)
         try:
-            # Serialize value for storage
-            serialized_value = pickle.dumps(value)
+            # Serialize value for storage, compressing large values (see
+            # _pack). pickle is kept over JSON codecs: for the record lists
+            # cached here it is smaller (it memoizes repeated dict keys), no
+            # slower, and keeps tuples, datetimes and Decimals intact.
+            serialized_value = _pack(value)
             cache.set(key, serialized_value, timeout)
             
             # Add to key registry
-            self.key_registry.add(key)
-            self._save_key_registry()
+            if self.key_registry.add(key):
+                self._mark_registry_dirty((key,))
             
-        except Exception as e:
-            print(f"Error setting cache key {key}: {e}")
+        except Exception:
+            logger.exception("Error setting cache key %s", key)
+    
+    def mset(self, mapping: Dict[str, Any], timeout: int = 3600) -> None:
+        """Set several key-value pairs in Memcached cache in one batch"""
+        # Resolve the calling app once for the whole batch
+        prefix = _app_scope_prefix()
+        try:
+            # Serialize values for storage
+            serialized_values = {f"{prefix}{key}": _pack(value) for key, value in mapping.items()}
+            cache.set_many(serialized_values, timeout)
+            
+            # Add to key registry with a single registry write
+            new_keys = self.key_registry.update(serialized_values)
+            if new_keys:
+                self._mark_registry_dirty(new_keys)
+            
+        except Exception:
+            logger.exception("Error setting cache keys")
     
     def get(self, key: str) -> Optional[Any]:
         """Get value by key from Memcached cache"""
+        key = _app_scoped_key(key)
         try:
             serialized_value = cache.get(key)
             if serialized_value is not None:
                 # Deserialize value
-                return pickle.loads(serialized_value)
+                return _unpack(serialized_value)
             else:
                 # Key doesn't exist or expired, remove from registry
-                self.key_registry.discard(key)
-                self._save_key_registry()
+                self._forget_keys((key,))
             return None
-        except Exception as e:
-            print(f"Error getting cache key {key}: {e}")
+        except Exception:
+            logger.exception("Error getting cache key %s", key)
             return None
     
     def delete(self, key: str) -> bool:
         """Delete a key from Memcached cache"""
+        key = _app_scoped_key(key)
         try:
             cache.delete(key)
             # Remove from key registry
-            self.key_registry.discard(key)
-            self._save_key_registry()
+            self._forget_keys((key,))
             return True
-        except Exception as e:
-            print(f"Error deleting cache key {key}: {e}")
+        except Exception:
+            logger.exception("Error deleting cache key %s", key)
             return False
     
     def refresh(self, key: str, timeout: int = 3600) -> bool:
         """Refresh timeout for a key in Memcached cache"""
+        key = _app_scoped_key(key)
         try:
-            # Get current value
-            serialized_value = cache.get(key)
-            if serialized_value is not None:
-                # Set with new timeout
-                cache.set(key, serialized_value, timeout)
+            # Memcached's touch resets the timeout without sending the value
+            # back and forth
+            if cache.touch(key, timeout):
                 return True
-            else:
-                # Key doesn't exist, remove from registry
-                self.key_registry.discard(key)
-                self._save_key_registry()
+            # Key doesn't exist, remove from registry
+            self._forget_keys((key,))
             return False
-        except Exception as e:
-            print(f"Error refreshing cache key {key}: {e}")
+        except Exception:
+            logger.exception("Error refreshing cache key %s", key)
             return False
     
     def clear(self) -> None:
@@ -320,8 +640,10 @@ class SimpleCache:
             # Clear key registry
             self.key_registry.clear()
             self._save_key_registry()
+            with self._registry_lock:
+                self._registry_version += 1
         except Exception as e:
-            print(f"Error clearing cache: {e}")
+            logger.error("Error clearing cache: %s", e)
     
     def size(self) -> int:
         """Get current cache size"""
@@ -349,71 +671,98 @@ class SimpleCache:
                 }
             }
         except Exception as e:
-            print(f"Error getting cache stats: {e}")
+            logger.error("Error getting cache stats: %s", e)
             return {'error': str(e)}
     
+    def _mark_registry_dirty(self, keys) -> None:
+        """Record that keys joined or left the registry, writing it only every few changes"""
+        # The registry key depends on the calling app, so remember it now
+        registry_key = self.registry_key
+        with self._registry_lock:
+            self._dirty_registry_shards.setdefault(registry_key, set()).update(map(_registry_shard, keys))
+            self._registry_mutations += 1
+            self._registry_version += 1
+            
+            # Without the auto-dump thread nothing would flush later
+            flush = self._registry_mutations >= self.registry_flush_threshold or self.auto_dump_interval <= 0
+        
+        if flush:
+            self._flush_registry()
+    
+    def _registry_shard_values(self, registry_key, shards) -> Dict[str, List[str]]:
+        """Map the given shard numbers of a registry to their Memcached keys and contents"""
+        return {f"{registry_key}:{shard}": self.key_registry.shard(shard) for shard in shards}
+    
+    def _flush_registry(self) -> None:
+        """Write the registry shards changed since the last flush"""
+        # Flushes are serialised so an older snapshot never overwrites a newer one
+        with self._flush_lock:
+            with self._registry_lock:
+                dirty_shards = self._dirty_registry_shards
+                if not dirty_shards:
+                    return
+                self._dirty_registry_shards = {}
+                self._registry_mutations = 0
+            
+            try:
+                values = {}
+                for registry_key, shards in dirty_shards.items():
+                    values.update(self._registry_shard_values(registry_key, shards))
+                cache.set_many(values, timeout=None)
+            except Exception as e:
+                logger.error("Error flushing key registry: %s", e)
+    
     def _save_key_registry(self) -> None:
         """Save key registry to Memcached"""
         try:
-            cache.set(self.registry_key, list(self.key_registry), timeout=None)
+            cache.set_many(self._registry_shard_values(self.registry_key, range(_REGISTRY_SHARDS)), timeout=None)
+            # Drop the registry written by the older single-key layout
+            cache.delete(self.registry_key)
         except Exception as e:
-            print(f"Error saving key registry: {e}")
+            logger.error("Error saving key registry: %s", e)
     
     def _load_key_registry(self) -> None:
         """Load key registry from Memcached"""
         try:
-            serialized_registry = cache.get(self.registry_key)
-            if serialized_registry is not None:
-                self.key_registry = pickle.loads(serialized_registry)
-            else:
-                self.key_registry = set()
+            keys, legacy = _read_registry(self.registry_key)
+            self.key_registry = _KeyRegistry(keys)
+            if legacy:
+                self._save_key_registry()
         except Exception as e:
-            print(f"Error loading key registry: {e}")
-            self.key_registry = set()
+            logger.error("Error loading key registry: %s", e)
+            self.key_registry = _KeyRegistry()
     
     def _cleanup_expired_keys(self) -> None:
-        """Remove expired keys from registry by checking each key"""
+        """Remove expired keys from registry by checking all keys in one batch"""
         try:
+            # Keys that don't exist or expired are missing from each batch,
+            # which is bounded to keep single requests small
+            tracked_keys = self.key_registry.snapshot()
             expired_keys = set()
-            for key in self.key_registry:
-                if cache.get(key) is None:  # Key doesn't exist or expired
-                    expired_keys.add(key)
+            for start in range(0, len(tracked_keys), _CLEANUP_BATCH_SIZE):
+                batch = tracked_keys[start:start + _CLEANUP_BATCH_SIZE]
+                expired_keys.update(set(batch).difference(cache.get_many(batch)))
             
-            # Remove expired keys from registry
-            self.key_registry -= expired_keys
-            self._save_key_registry()
+            # Remove expired keys from registry, writing only the shards they were in
+            self._forget_keys(expired_keys)
+            self._flush_registry()
             
             if expired_keys:
-                print(f"Cleaned up {len(expired_keys)} expired keys from registry")
+                logger.info("Cleaned up %s expired keys from registry", len(expired_keys))
                 
         except Exception as e:
-            print(f"Error cleaning up expired keys: {e}")
+            logger.error("Error cleaning up expired keys: %s", e)
     
     async def dump_cache(self) -> bool:
-        """Async dump cache to file"""
+        """Async dump cache to file without blocking the event loop"""
+        # Cleanup, serialization and the fsync'd write all block, so run the
+        # synchronous dump in a worker thread. to_thread copies the context,
+        # so the pinned app keeps the dump on the caller's registry
+        token = _PINNED_APP.set(_get_calling_app())
         try:
-            # Clean up expired keys first
-            self._cleanup_expired_keys()
-            
-            dump_data = {
-                'timestamp': datetime.now().isoformat(),
-                'cache_backend': 'memcached',
-                'key_registry': list(self.key_registry),
-                'total_keys': len(self.key_registry),
-                'auto_dump_interval': self.auto_dump_interval,
-                'env_config': {
-                    'CACHE_DUMP_FILE': os.environ.get('CACHE_DUMP_FILE', '/tmp/cache_dump.json'),
-                    'CACHE_MAX_SIZE': os.environ.get('CACHE_MAX_SIZE', '1000'),
-                    'CACHE_AUTO_DUMP_INTERVAL': os.environ.get('CACHE_AUTO_DUMP_INTERVAL', '300')
-                }
-            }
-            
-            # Use atomic dump
-            return self._atomic_dump_to_file(dump_data)
-            
-        except Exception as e:
-            print(f"Error dumping cache: {e}")
-            return False
+            return await asyncio.to_thread(self.dump_cache_sync)
+        finally:
+            _PINNED_APP.reset(token)
     
     def load_cache(self) -> bool:
         """Load cache from file on startup"""
@@ -422,92 +771,181 @@ class SimpleCache:
             self._load_key_registry()
             
             if os.path.exists(self.dump_file):
-                with open(self.dump_file, 'r') as f:
-                    dump_data = json.load(f)
+                with open(self.dump_file, 'rb') as f:
+                    dump_data = _decode_json(f.read())
+                
+                # Rebuild what was last dumped so later dumps can keep appending
+                # to the log instead of starting with a full rewrite
+                dumped_keys = set(dump_data.get('key_registry', ()))
+                replayed = self._replay_wal(dump_data.get('timestamp'), dumped_keys)
+                if replayed is not None:
+                    self._dumped_keys = dumped_keys
+                    self._wal_snapshot = dump_data.get('timestamp')
+                    self._wal_started = os.path.exists(self.wal_file)
                 
-                print(f"Cache metadata loaded from {self.dump_file}")
-                print(f"Key registry loaded: {len(self.key_registry)} keys")
+                logger.info("Cache metadata loaded from %s", self.dump_file)
+                if replayed:
+                    logger.info("Replayed %s registry changes from %s", replayed, self.wal_file)
+                logger.info("Key registry loaded: %s keys", len(self.key_registry))
                 return True
             else:
-                print(f"No cache dump file found at {self.dump_file}")
-                print(f"Memcached cache will start fresh")
+                logger.info("No cache dump file found at %s", self.dump_file)
+                logger.info("Memcached cache will start fresh")
                 return False
         except Exception as e:
-            print(f"Error loading cache: {e}")
+            logger.error("Error loading cache: %s", e)
+            return False
+    
+    def _replay_wal(self, snapshot: Optional[str], keys: set) -> Optional[int]:
+        """Apply the write-ahead log to the snapshot's keys, returning the number of records applied"""
+        try:
+            with open(self.wal_file, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return 0
+        
+        # The first line names the snapshot the log amends. A log left behind
+        # by an older snapshot is ignored and replaced by the next full dump.
+        try:
+            if not lines or _decode_json(lines[0]).get('snapshot') != snapshot:
+                return None
+        except (ValueError, AttributeError):
+            return None
+        
+        applied = 0
+        for line in lines[1:]:
+            try:
+                record = _decode_json(line)
+            except ValueError:
+                # A crash cut an append short. Appending after it would corrupt
+                # the next record, so have the next dump rewrite the snapshot.
+                return None
+            if record.get('op') == 's':
+                keys.add(record['k'])
+            elif record.get('op') == 'd':
+                keys.discard(record['k'])
+            applied += 1
+        return applied
+    
+    def _wal_needs_compaction(self) -> bool:
+        """Whether the next dump should rewrite the snapshot instead of appending to the log"""
+        if self._dumped_keys is None:
+            return True
+        try:
+            snapshot_size = os.path.getsize(self.dump_file)
+        except OSError:
+            return True
+        try:
+            wal_size = os.path.getsize(self.wal_file)
+        except OSError:
+            wal_size = 0
+        return wal_size >= _WAL_COMPACT_RATIO * snapshot_size
+    
+    def _append_to_wal(self, tracked_keys: List[str]) -> bool:
+        """Append the keys added and removed since the last dump to the write-ahead log"""
+        current = set(tracked_keys)
+        records = [{'op': 's', 'k': key} for key in current - self._dumped_keys]
+        records += [{'op': 'd', 'k': key} for key in self._dumped_keys - current]
+        if not records:
+            return True
+        
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        if not self._wal_started:
+            # Start a fresh log for the current snapshot
+            records.insert(0, {'snapshot': self._wal_snapshot})
+            flags |= os.O_TRUNC
+        
+        try:
+            fd = os.open(self.wal_file, flags, 0o644)
+            try:
+                _write_all(fd, b''.join(_encode_json(record) + b'\n' for record in records))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except Exception as e:
+            logger.error("Error appending to cache write-ahead log: %s", e)
+            # The log may now end in a partial write, so rewrite the snapshot next time
+            self._dumped_keys = None
             return False
+        
+        self._dumped_keys = current
+        self._wal_started = True
+        return True
     
     def dump_cache_sync(self) -> bool:
         """Synchronous dump cache to file"""
+        # Clean up expired keys first
+        self._cleanup_expired_keys()
+        return self._write_dump()
+    
+    def _write_dump(self) -> bool:
+        """Write the registry to the dump file, or append the changes to its log"""
         try:
-            # Clean up expired keys first
-            self._cleanup_expired_keys()
-            
-            dump_data = {
-                'timestamp': datetime.now().isoformat(),
-                'cache_backend': 'memcached',
-                'key_registry': list(self.key_registry),
-                'total_keys': len(self.key_registry),
-                'auto_dump_interval': self.auto_dump_interval,
-                'env_config': {
-                    'CACHE_DUMP_FILE': os.environ.get('CACHE_DUMP_FILE', '/tmp/cache_dump.json'),
-                    'CACHE_MAX_SIZE': os.environ.get('CACHE_MAX_SIZE', '1000'),
-                    'CACHE_AUTO_DUMP_INTERVAL': os.environ.get('CACHE_AUTO_DUMP_INTERVAL', '300')
+            # Dumps diff against what the last one wrote, so run one at a time
+            with self._dump_lock:
+                # Serialize and write from one snapshot, outside the registry locks
+                tracked_keys = self.key_registry.snapshot()
+                
+                # Write only the changes while the log is small next to the snapshot
+                if not self._wal_needs_compaction():
+                    return self._append_to_wal(tracked_keys)
+                
+                dump_data = {
+                    'timestamp': datetime.now().isoformat(),
+                    'cache_backend': 'memcached',
+                    'key_registry': tracked_keys,
+                    'total_keys': len(tracked_keys),
+                    'auto_dump_interval': self.auto_dump_interval,
+                    'env_config': {
+                        'CACHE_DUMP_FILE': os.environ.get('CACHE_DUMP_FILE', '/tmp/cache_dump.json'),
+                        'CACHE_MAX_SIZE': os.environ.get('CACHE_MAX_SIZE', '1000'),
+                        'CACHE_AUTO_DUMP_INTERVAL': os.environ.get('CACHE_AUTO_DUMP_INTERVAL', '300')
+                    }
                 }
-            }
-            
-            # Use atomic dump
-            return self._atomic_dump_to_file(dump_data)
+                
+                # Use atomic dump
+                if not self._atomic_dump_to_file(dump_data):
+                    self._dumped_keys = None
+                    return False
+                
+                # The new snapshot supersedes the log
+                self._dumped_keys = set(tracked_keys)
+                self._wal_snapshot = dump_data['timestamp']
+                self._wal_started = False
+                try:
+                    os.remove(self.wal_file)
+                except OSError:
+                    pass
+                return True
             
         except Exception as e:
-            print(f"Error dumping cache: {e}")
+            logger.error("Error dumping cache: %s", e)
             return False
 
     @property
     def registry_key(self):
         return _app_scoped_registry_key()
-
-# Global cache instance with environment-based configuration
-simple_cache = SimpleCache() 
-
-# Patch all public cache operations to use app-scoped keys
-class SimpleCache(SimpleCache):
-    def set(self, key: str, value: Any, timeout: int = 3600) -> None:
-        return super().set(_app_scoped_key(key), value, timeout)
-
-    def get(self, key: str) -> Optional[Any]:
-        return super().get(_app_scoped_key(key))
-
-    def delete(self, key: str) -> bool:
-        return super().delete(_app_scoped_key(key))
-
-    def refresh(self, key: str, timeout: int = 3600) -> bool:
-        return super().refresh(_app_scoped_key(key), timeout)
-
-    def _save_key_registry(self) -> None:
-        # Save the key registry to Memcached under the app-scoped registry key
-        cache.set(self.registry_key, list(self.key_registry), timeout=None)
-
-    def _load_key_registry(self) -> None:
-        # Load the key registry from Memcached under the app-scoped registry key
-        keys = cache.get(self.registry_key)
-        if keys:
-            self.key_registry = set(keys)
-        else:
-            self.key_registry = set()
-
-    # Optionally, add a method for the cache app to get all registries
+    
     def get_all_registries(self):
+        """Get the tracked keys of every app's registry, keyed by app name"""
+        registry_keys = {app: f"{app}:cache_key_registry" for app in LOCAL_APPS}
+        # Also include the global registry if present
+        registry_keys['global'] = "cache_key_registry"
+        
+        # Fetch every shard of every registry, and any registry still in the
+        # older single-key layout, in one round-trip
+        stored = cache.get_many([
+            shard_key for registry_key in registry_keys.values()
+            for shard_key in [registry_key, *_registry_shard_keys(registry_key)]
+        ])
+        
         registries = {}
-        for app in LOCAL_APPS:
-            key = f"{app}:cache_key_registry"
-            keys = cache.get(key)
+        for app, registry_key in registry_keys.items():
+            shards = [stored[shard_key] for shard_key in _registry_shard_keys(registry_key) if shard_key in stored]
+            keys = set().union(*shards) if shards else set(stored.get(registry_key) or ())
             if keys:
-                registries[app] = set(keys)
-        # Also include the global registry if present
-        global_keys = cache.get("cache_key_registry")
-        if global_keys:
-            registries['global'] = set(global_keys)
+                registries[app] = keys
         return registries
 
 # Global cache instance with environment-based configuration
-simple_cache = SimpleCache() 
\ No newline at end of file
+simple_cache = SimpleCache()